@@ -26,14 +26,14 @@ def get_tasks_by_assignee(assignee: str):
               description, issue_type, status, status_category, project, assignee, 
               reporter, created, updated, time_spent_seconds, and url.
     """
-    sql = f"""
+    sql = """
     SELECT key, parent_key, summary, description, issue_type, status, 
            status_category, project, assignee, reporter, created, updated, 
            time_spent_seconds, url 
     FROM jira_task 
-    WHERE assignee = '{assignee}'
+    WHERE assignee = %(assignee)s
     """
-    return get_issues_from_db(sql)
+    return get_issues_from_db(sql, assignee=assignee)
 
 
 def get_tasks_by_project(project: str):
@@ -49,14 +49,14 @@ def get_tasks_by_project(project: str):
               description, issue_type, status, status_category, project, assignee, 
               reporter, created, updated, time_spent_seconds, and url.
     """
-    sql = f"""
+    sql = """
     SELECT key, parent_key, summary, description, issue_type, status, 
            status_category, project, assignee, reporter, created, updated, 
            time_spent_seconds, url 
     FROM jira_task 
-    WHERE project = '{project}'
+    WHERE project = %(project)s
     """
-    return get_issues_from_db(sql)
+    return get_issues_from_db(sql, project=project)
 
 
 def get_bugs_by_status(status: str):
@@ -72,14 +72,14 @@ def get_bugs_by_status(status: str):
               issue_type, status, status_category, project, assignee, reporter, 
               created, updated, time_spent_seconds, and url.
     """
-    sql = f"""
+    sql = """
     SELECT key, summary, description, issue_type, status, 
            status_category, project, assignee, reporter, created, 
            updated, time_spent_seconds, url 
     FROM jira_bug 
-    WHERE status = '{status}'
+    WHERE status = %(status)s
     """
-    return get_issues_from_db(sql)
+    return get_issues_from_db(sql, status=status)
 
 
 def get_subtasks_by_parent_key(parent_key: str):
@@ -95,14 +95,14 @@ def get_subtasks_by_parent_key(parent_key: str):
               status, status_category, assignee, created, updated, 
               time_spent_seconds, and url.
     """
-    sql = f"""
+    sql = """
     SELECT key, parent_key, summary, status, 
            status_category, assignee, created, updated, 
            time_spent_seconds, url 
     FROM jira_subtask 
-    WHERE parent_key = '{parent_key}'
+    WHERE parent_key = %(parent_key)s
     """
-    return get_issues_from_db(sql)
+    return get_issues_from_db(sql, parent_key=parent_key)
 
 
 def get_tasks_by_description_similarity(text: str):
@@ -118,41 +118,12 @@ def get_tasks_by_description_similarity(text: str):
               description, issue_type, status, status_category, project, assignee, 
               reporter, created, updated, time_spent_seconds, and url.
     """
-    res = []
     embedding = db_client.create_embedding(text)
-    sql = f"""
-    SELECT key, parent_key, summary, description, issue_type, status, 
-           status_category, project, assignee, reporter, created, 
-           updated, time_spent_seconds, url, 
-           description_vector <=> '{embedding}' AS similarity
-    FROM jira_task
-    ORDER BY similarity DESC
-    LIMIT 5
-    """
-    res.append(get_issues_from_db(sql))
-    sql = f"""
-    SELECT key, parent_key, summary, description, status, 
-           status_category, assignee, created, 
-           updated, time_spent_seconds, url, 
-           description_vector <=> '{embedding}' AS similarity
-    FROM jira_subtask
-    ORDER BY similarity DESC
-    LIMIT 5
-    """
-    res.append(get_issues_from_db(sql))
-
-    sql = f"""
-    SELECT key, parent_key, summary, description, issue_type, status,
-              status_category, project, assignee, reporter, created, 
-              updated, time_spent_seconds, url, 
-              description_vector <=> '{embedding}' AS similarity
-    FROM jira_bug
-    ORDER BY similarity DESC
-    LIMIT 5
-    """
-    res.append(get_issues_from_db(sql))
-
-    return res
+    return [
+        get_issues_by_vector(embedding, "match_jira_task_description"),
+        get_issues_by_vector(embedding, "match_jira_subtask_description"),
+        get_issues_by_vector(embedding, "match_jira_bug_description"),
+    ]
 
 
 def get_tasks_and_subtasks_by_summary_similarity(text: str):
@@ -168,26 +139,27 @@ def get_tasks_and_subtasks_by_summary_similarity(text: str):
               description, issue_type, status, status_category, project, assignee, 
               reporter, created, updated, time_spent_seconds, and url.
               """
-    sql = f"""
-    SELECT key, parent_key, summary, description, issue_type, status, 
-           status_category, project, assignee, reporter, created, 
-           updated, time_spent_seconds, url 
-    FROM (
-        SELECT * FROM jira_task
-        UNION ALL
-        SELECT * FROM jira_subtask
-    ) AS combined_tasks
-    ORDER BY summary_vector <=> '{text}'
-    LIMIT 5
-    """
-    return get_issues_from_db(sql)
+    embedding = db_client.create_embedding(text)
+    return get_issues_by_vector(embedding, "match_jira_task_and_subtask_summary")
 
 
 # --- Generic execution helper ---
 
-def get_issues_from_db(sql_statement: str) -> list:
+def get_issues_by_vector(embedding, statement_name: str, limit: int = 5) -> list:
+    """
+    Fetches the issues closest to the embedding with a prepared similarity query,
+    binding the vector as a parameter instead of formatting it into the SQL.
+    """
+    res = db_client.get_matches_by_vector(embedding, statement_name, limit=limit)
+    logger.info("Query returned %d records.", len(res))
+    return res
+
+
+def get_issues_from_db(sql_statement: str, **params) -> list:
     """
     Fetches issues from the database and returns them as a list of dictionaries.
+    Values are passed as params and bound by the driver (%(name)s placeholders),
+    never formatted into the SQL text.
     """
     ALLOWED_TABLES = {"jira_task", "jira_subtask", "jira_bug"}
 
@@ -198,7 +170,7 @@ def get_issues_from_db(sql_statement: str) -> list:
             )
         return ["Invalid SQL statement."]
 
-    res = db_client.execute_sql(sql_statement)
+    res = db_client.execute_sql(sql_statement, **params)
     if res is None:
         logger.error("Query returned no results or failed.")
         return []
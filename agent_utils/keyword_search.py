@@ -91,12 +91,12 @@ def keyword_search(
             raise ValueError(f"Unknown match_mode: {match_mode}")
 
     keywords = get_keywords(query)
-    logger.debug(f"Extracted keywords: {keywords}")
+    logger.debug("Extracted keywords: %s", keywords)
     hdlr = JiraHandler()
     start = time.time()
     issues = hdlr.fetch_and_parse_issues(jql="project=DATA")
     stop = time.time()
-    logger.debug(f"Fetched issues in {stop - start:.2f} seconds")
+    logger.debug("Fetched issues in %.2f seconds", stop - start)
 
     return [
         issue for issue in issues
@@ -138,7 +138,7 @@ def better_keyword_search(
     )
     
     keywords = [kw for kw, _ in extracted_keywords]
-    logger.debug(f"Extracted keywords with KeyBERT: {keywords}")
+    logger.debug("Extracted keywords with KeyBERT: %s", keywords)
 
     # Baue die JQL-Query
     jql_query = "project=DATA AND ("
@@ -152,7 +152,7 @@ def better_keyword_search(
             jql_query += " AND "
     jql_query += ")"
 
-    logger.debug(f"Generated JQL query: {jql_query}")
+    logger.debug("Generated JQL query: %s", jql_query)
 
     # Führe die Suche mit deinem Jira-Handler aus
     hdlr = JiraHandler()
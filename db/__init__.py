@@ -1,14 +1,26 @@
 from .create_tables import (
+    bulk_ingest,
     create_jira_tables,
-    drop_jira_tables
+    create_jira_filter_indexes,
+    create_jira_indexes,
+    drop_jira_indexes,
+    drop_jira_tables,
+    migrate_vector_precision
 )
 from .vectordb_client import VectorDB, DBConfig
 from .query_store import QueryStore
+from .embedding_cache import EmbeddingCache
 
 __all__ = [
+    "bulk_ingest",
     "create_jira_tables",
+    "create_jira_filter_indexes",
+    "create_jira_indexes",
+    "drop_jira_indexes",
     "drop_jira_tables",
+    "migrate_vector_precision",
     "VectorDB",
     "DBConfig",
     "QueryStore",
+    "EmbeddingCache",
 ]
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+binary_copy.py
+
+This module encodes rows in the binary format of PostgreSQL's COPY command, so
+that bulk loads can send every embedding as 4 (vector) or 2 (halfvec) bytes per
+dimension instead of its text representation, which the server must parse again.
+
+Features:
+- COPY BINARY header, tuples and trailer.
+- Encoders for the column types of the Jira tables (text, integers, timestamps,
+  vector and halfvec via the pgvector binary representation).
+
+Author: Patrick Scheich
+Date: 2025-03-28
+"""
+
+import io
+import struct
+from datetime import datetime, timezone
+
+from pgvector import HalfVector, Vector
+
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_HEADER = COPY_SIGNATURE + struct.pack(">ii", 0, 0)
+_TRAILER = struct.pack(">h", -1)
+_NULL = struct.pack(">i", -1)
+_POSTGRES_EPOCH = datetime(2000, 1, 1)
+
+
+def _encode_timestamp(value) -> bytes:
+    """
+    Encodes a datetime (or ISO 8601 string) as microseconds since 2000-01-01.
+    Timezone-aware values are converted to UTC first, as the columns store no time zone.
+    """
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _POSTGRES_EPOCH
+    return struct.pack(">q", (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds)
+
+
+ENCODERS = {
+    "text": lambda value: str(value).encode(),
+    "varchar": lambda value: str(value).encode(),
+    "int4": lambda value: struct.pack(">i", int(value)),
+    "int8": lambda value: struct.pack(">q", int(value)),
+    "bool": lambda value: b"\x01" if value else b"\x00",
+    "timestamp": _encode_timestamp,
+    "vector": lambda value: Vector(value).to_binary(),
+    "halfvec": lambda value: HalfVector(value).to_binary(),
+}
+
+
+def supports(column_types) -> bool:
+    """
+    Returns True if every given column type (pg_type name) can be encoded.
+    """
+    return all(column_type in ENCODERS for column_type in column_types)
+
+
+def encode_rows(rows, columns, column_types) -> io.BytesIO:
+    """
+    Encodes rows as a COPY ... FROM STDIN WITH (FORMAT BINARY) stream.
+    Args:
+        rows (Iterable[dict]): The column values of each row.
+        columns (tuple): The column names in COPY order.
+        column_types (tuple): The pg_type name of each column, e.g. "text" or "vector".
+    Returns:
+        io.BytesIO: The stream, positioned at its start.
+    Raises:
+        KeyError: If a column type has no encoder.
+    """
+    encoders = [ENCODERS[column_type] for column_type in column_types]
+    field_count = struct.pack(">h", len(columns))
+    buffer = io.BytesIO()
+    buffer.write(_HEADER)
+    for row in rows:
+        buffer.write(field_count)
+        for column, encode in zip(columns, encoders):
+            value = row.get(column)
+            if value is None:
+                buffer.write(_NULL)
+                continue
+            data = encode(value)
+            buffer.write(struct.pack(">i", len(data)))
+            buffer.write(data)
+    buffer.write(_TRAILER)
+    buffer.seek(0)
+    return buffer
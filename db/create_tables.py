@@ -5,32 +5,291 @@ tables related to Jira issues and subtasks.
 It also includes logging to track the success or failure of these operations.
 """
 
-from db.vectordb_client import VectorDB
+import time
+from contextlib import contextmanager
+
+from db.vectordb_client import VectorDB, VECTOR_PRECISIONS
 from db.query_store import QueryStore
 from lib.logger import logger
 
+JIRA_TABLES = ("jira_issue", "jira_subtask", "jira_task", "jira_bug")
+VECTOR_COLUMNS = ("summary_vector", "description_vector")
+# Columns filtered on by the issue lookups (agent_utils.issue_context_tools and the
+# issue_exists check), indexed so the filters do not scan the whole table.
+FILTER_COLUMNS = {
+    "jira_subtask": ("parent_key",),
+    "jira_task": ("key", "assignee", "project"),
+    "jira_bug": ("key", "status"),
+}
+
+# Settings for index builds. HNSW builds are much faster when the graph fits
+# into maintenance_work_mem.
+INDEX_MAINTENANCE_WORK_MEM = "2GB"
+INDEX_PARALLEL_WORKERS = 7
+INDEX_MAX_PARALLEL_WORKERS = 16
+# pgvector builds HNSW indexes with parallel workers from this version on.
+PARALLEL_HNSW_VERSION = (0, 6, 0)
+# With index_type "auto", tables with more rows than this get an IVFFlat index.
+IVFFLAT_MIN_ROWS = 1_000_000
+
+
+def pgvector_version(client: VectorDB) -> tuple:
+    """
+    Returns the installed pgvector version as a tuple of ints, e.g. (0, 7, 4),
+    or an empty tuple if the extension is not installed.
+    """
+    rows = client.execute_sql("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    if not rows:
+        return ()
+    return tuple(int(part) for part in rows[0][0].split(".") if part.isdigit())
+
+
+def configure_hnsw_params(vector_count: int) -> dict:
+    """
+    Returns HNSW build parameters for the given number of vectors.
+    Larger graphs need more links per node (m) and a larger candidate list while
+    building (ef_construction) to keep recall high.
+    """
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 100}
+    return {"m": 32, "ef_construction": 128}
+
+
+def configure_ivfflat_lists(vector_count: int) -> int:
+    """
+    Returns the number of IVFFlat lists for the given number of vectors
+    (rows / 1000 up to a million rows, sqrt(rows) above, as recommended by pgvector).
+    """
+    if vector_count <= 1_000_000:
+        return max(1, vector_count // 1000)
+    return int(vector_count ** 0.5)
+
+
+def choose_index_type(client: VectorDB, vector_count: int) -> str:
+    """
+    Resolves the client's index_type for a table with the given number of vectors.
+    "auto" picks IVFFlat for large, bulk-loaded tables, where it builds much faster
+    than HNSW, and HNSW otherwise.
+    """
+    if client.index_type != "auto":
+        return client.index_type
+    return "ivfflat" if vector_count > IVFFLAT_MIN_ROWS else "hnsw"
+
+
+def vector_column_types(client: VectorDB) -> dict:
+    """
+    Reads the type of every vector column of the Jira tables from the live schema
+    (information_schema.columns.udt_name), as existing tables may still have the
+    precision they were created with rather than the client's vector_precision.
+    Returns:
+        dict: The type ("vector" or "halfvec") of each (table, column).
+    Raises:
+        RuntimeError: If a vector column is missing or has no supported vector type.
+    """
+    rows = client.execute_sql(
+        """
+        SELECT table_name, column_name, udt_name FROM information_schema.columns
+        WHERE table_schema = current_schema()
+        AND table_name IN %(tables)s AND column_name IN %(columns)s
+        """,
+        tables=JIRA_TABLES,
+        columns=VECTOR_COLUMNS,
+    )
+    types = {(table, column): udt_name for table, column, udt_name in rows}
+    unresolved = [
+        f"{table}.{column}"
+        for table in JIRA_TABLES
+        for column in VECTOR_COLUMNS
+        if types.get((table, column)) not in VECTOR_PRECISIONS
+    ]
+    if unresolved:
+        raise RuntimeError(f"Cannot resolve the vector type of {', '.join(unresolved)}.")
+    return types
+
+
+def create_jira_indexes(client: VectorDB, vector_count: int = None, vector_type: str = None,
+                        vector_types: dict = None):
+    """
+    Creates a vector index on every vector column of the Jira tables, of the type
+    configured by the client's index_type (see choose_index_type) and with the operator
+    class of its distance_metric.
+    Args:
+        client (VectorDB): The database client.
+        vector_count (int): The expected number of rows per table. If omitted, the
+            current row count of each table is used to choose the index type and parameters.
+        vector_type (str): The column type the operator class is chosen for, for all columns.
+        vector_types (dict): The column type of each (table, column), see vector_column_types.
+            If neither is given, the types are read from the live schema.
+    """
+    opclass = QueryStore.DISTANCE_METRICS[client.distance_metric][1]
+    try:
+        if vector_type:
+            vector_types = {(table, column): vector_type
+                            for table in JIRA_TABLES for column in VECTOR_COLUMNS}
+        vector_types = vector_types or vector_column_types(client)
+        version = pgvector_version(client)
+        # SET LOCAL keeps the build settings off the pooled connection after the commit.
+        with client.transaction():
+            client.execute_sql(f"SET LOCAL maintenance_work_mem = '{INDEX_MAINTENANCE_WORK_MEM}'")
+            if version >= PARALLEL_HNSW_VERSION:
+                client.execute_sql(f"SET LOCAL max_parallel_maintenance_workers = {INDEX_PARALLEL_WORKERS}")
+                client.execute_sql(f"SET LOCAL max_parallel_workers = {INDEX_MAX_PARALLEL_WORKERS}")
+            else:
+                logger.warning(
+                    "pgvector %s builds HNSW indexes single-threaded; upgrade to 0.6+ for parallel builds.",
+                    ".".join(map(str, version)) or "(not installed)",
+                )
+            for table in JIRA_TABLES:
+                count = vector_count
+                if count is None:
+                    count = client.execute_sql(f"SELECT count(*) FROM {table}")[0][0]
+                index_type = choose_index_type(client, count)
+                if index_type == "flat":
+                    logger.info("No vector index on %s (exact search).", table)
+                    continue
+                if index_type == "ivfflat":
+                    params = {"lists": client.ivf_lists or configure_ivfflat_lists(count)}
+                else:
+                    params = configure_hnsw_params(count)
+                    params["m"] = client.hnsw_m or params["m"]
+                    params["ef_construction"] = client.hnsw_ef_construction or params["ef_construction"]
+                for column in VECTOR_COLUMNS:
+                    logger.info("Creating %s index on %s.%s (%s)...", index_type, table, column,
+                                ", ".join(f"{name}={value}" for name, value in params.items()))
+                    start = time.perf_counter()
+                    client.execute_sql(QueryStore.get_sql(
+                        f"create_{index_type}_index", table=table, column=column,
+                        vector_type=vector_types[table, column], opclass=opclass, **params
+                    ))
+                    logger.info("%s index on %s.%s built in %.1fs.",
+                                index_type, table, column, time.perf_counter() - start)
+
+        logger.info("All Jira indexes created successfully.")
+    except KeyError as e:
+        logger.error("SQL query key not found: %s", e)
+    except ConnectionError as e:
+        logger.error("Database connection error: %s", e)
+    except RuntimeError as e:
+        logger.error("Runtime error while creating Jira indexes: %s", e)
+
+
+def create_jira_filter_indexes(client: VectorDB):
+    """
+    Creates a B-tree index on every column in FILTER_COLUMNS.
+    """
+    try:
+        for table, columns in FILTER_COLUMNS.items():
+            for column in columns:
+                client.execute_sql(QueryStore.get_sql("create_btree_index", table=table, column=column))
+        logger.info("All Jira filter indexes created successfully.")
+    except KeyError as e:
+        logger.error("SQL query key not found: %s", e)
+    except ConnectionError as e:
+        logger.error("Database connection error: %s", e)
+    except RuntimeError as e:
+        logger.error("Runtime error while creating Jira filter indexes: %s", e)
+
+
+def drop_jira_indexes(client: VectorDB):
+    """
+    Drops the vector indexes (HNSW and IVFFlat) of the Jira tables.
+    """
+    try:
+        for table in JIRA_TABLES:
+            for column in VECTOR_COLUMNS:
+                client.execute_sql(QueryStore.get_sql("drop_hnsw_index", table=table, column=column))
+                client.execute_sql(QueryStore.get_sql("drop_ivfflat_index", table=table, column=column))
+        logger.info("All Jira indexes dropped successfully.")
+    except KeyError as e:
+        logger.error("SQL query key not found: %s", e)
+    except ConnectionError as e:
+        logger.error("Database connection error: %s", e)
+    except RuntimeError as e:
+        logger.error("Runtime error while dropping Jira indexes: %s", e)
+
+
+@contextmanager
+def bulk_ingest(client: VectorDB):
+    """
+    Drops the vector indexes for the duration of a bulk load and rebuilds them afterwards.
+    Building the graph once over all rows is much faster than maintaining it on every
+    insert, and yields an index of at least the same quality. The indexes are rebuilt
+    even if the load fails, sized for the rows that are in the tables by then, with the
+    operator class of each column's type in the live schema.
+    Usage:
+        with bulk_ingest(client):
+            ingestor.ingest_bulk(...)
+    Raises:
+        RuntimeError: If the column types cannot be resolved; no index is dropped then.
+    """
+    vector_types = vector_column_types(client)
+    drop_jira_indexes(client)
+    start = time.perf_counter()
+    try:
+        yield client
+    finally:
+        logger.info("Bulk load finished in %.1fs, rebuilding indexes...", time.perf_counter() - start)
+        start = time.perf_counter()
+        create_jira_indexes(client, vector_types=vector_types)
+        logger.info("Indexes rebuilt in %.1fs.", time.perf_counter() - start)
+
+
+def migrate_vector_precision(client: VectorDB, vector_type: str = None):
+    """
+    Converts the vector columns of existing Jira tables to another precision
+    (e.g. from vector to halfvec). The vector indexes depend on the column type,
+    so they are dropped before and rebuilt after the conversion.
+    Args:
+        client (VectorDB): The database client.
+        vector_type (str): The target column type. Defaults to the client's vector_precision.
+    """
+    vector_type = vector_type or client.vector_precision
+    drop_jira_indexes(client)
+    try:
+        for table in JIRA_TABLES:
+            for column in VECTOR_COLUMNS:
+                logger.info("Converting %s.%s to %s...", table, column, vector_type)
+                client.execute_sql(QueryStore.get_sql(
+                    "alter_vector_column_type", table=table, column=column, vector_type=vector_type
+                ))
+        logger.info("All Jira vector columns converted to %s.", vector_type)
+    except KeyError as e:
+        logger.error("SQL query key not found: %s", e)
+    except ConnectionError as e:
+        logger.error("Database connection error: %s", e)
+    except RuntimeError as e:
+        logger.error("Runtime error while converting Jira vector columns: %s", e)
+
+    create_jira_indexes(client, vector_type=vector_type)
+
+
 def create_jira_tables(client: VectorDB):
     """
     Creates the tables necessary for storing Jira issues and subtasks.
     """
     try:
         logger.info("Creating jira_issue table...")
-        sql_issue = QueryStore.get_sql("create_jira_issue_table")
+        sql_issue = QueryStore.get_sql("create_jira_issue_table", vector_type=client.vector_precision)
         client.execute_sql(sql_issue)
 
         logger.info("Creating jira_subtask table...")
-        sql_subtask = QueryStore.get_sql("create_jira_subtask_table")
+        sql_subtask = QueryStore.get_sql("create_jira_subtask_table", vector_type=client.vector_precision)
         client.execute_sql(sql_subtask)
 
         logger.info("Creating jira_task table...")
-        sql_task = QueryStore.get_sql("create_jira_task_table")
+        sql_task = QueryStore.get_sql("create_jira_task_table", vector_type=client.vector_precision)
         client.execute_sql(sql_task)
 
         logger.info("Creating jira_bug table...")
-        sql_bug = QueryStore.get_sql("create_jira_bug_table")
+        sql_bug = QueryStore.get_sql("create_jira_bug_table", vector_type=client.vector_precision)
         client.execute_sql(sql_bug)
 
         logger.info("All Jira tables created successfully.")
+
+        create_jira_filter_indexes(client)
+        create_jira_indexes(client)
     except KeyError as e:
         logger.error("SQL query key not found: %s", e)
     except ConnectionError as e:
@@ -0,0 +1,203 @@
+"""
+embedding_cache.py
+
+This module provides the EmbeddingCache class, which keeps embeddings that were
+already computed so that repeated (or nearly identical) texts do not trigger
+another request to the embedding endpoint.
+
+Features:
+- In-memory LRU for hot entries.
+- Optional SQLite file for persistence across runs.
+- Optional (opt-in) near-duplicate lookup against the most recently cached texts: an
+  exact match after normalization (case, whitespace, trailing punctuation), then a
+  fuzzy match.
+- Hit/miss counters for monitoring.
+
+Author: Patrick Scheich
+Date: 2025-03-28
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from rapidfuzz import fuzz
+
+from lib.logger import logger
+
+
+class EmbeddingCache:
+    """
+    A two-level cache (memory LRU + optional SQLite file) for text embeddings.
+    Entries are keyed by the SHA-256 of (model, dimensions, text), so vectors of
+    different models or dimensions never mix. The text is hashed with its whitespace
+    normalized, so re-synced texts that only differ in spacing or line endings hit.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        dimensions: int,
+        path: str = None,
+        maxsize: int = 65536,
+        fuzzy_threshold: float = None,
+        recent: int = 64,
+    ):
+        """
+        Args:
+            model (str): The embedding model name.
+            dimensions (int): The embedding dimensions.
+            path (str): Optional SQLite file for persistent entries (memory only if omitted).
+            maxsize (int): The maximum number of entries kept in memory.
+            fuzzy_threshold (float): Opt-in: reuse the vector of a recently cached text that is
+                equal after normalization or whose rapidfuzz ratio (0-100) is above this value. Near-duplicates such as ticket
+                summaries that only differ in an issue number score above 95, so only enable
+                it where sharing their vector is acceptable. None (default) disables it.
+            recent (int): The number of recently cached texts compared on an exact miss
+                (only with fuzzy_threshold set).
+        """
+        self.model = model
+        self.dimensions = dimensions
+        self.maxsize = maxsize
+        self.fuzzy_threshold = fuzzy_threshold
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self.recent = recent
+        # Normalized text -> key of the most recently cached texts, oldest first.
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """
+        Folds the differences that do not change the meaning of a short text such as a
+        Jira summary: case, whitespace and trailing punctuation.
+        """
+        return " ".join(text.lower().split()).rstrip(".,;:!? ")
+
+    def _key(self, text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{self.model}:{self.dimensions}:{normalized}".encode()).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str):
+        """
+        Returns the cached embedding of the text, or None on a miss.
+        """
+        if not text or not isinstance(text, str):
+            return None
+        key = self._key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is None and self._db is not None:
+                row = self._db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+                if row:
+                    vector = np.frombuffer(row[0], dtype=np.float32).copy()
+            if vector is not None:
+                self._remember(key, vector)
+                self.hits += 1
+                return vector
+
+            vector = self._near_match(text)
+            if vector is not None:
+                self.near_hits += 1
+                return vector
+
+            self.misses += 1
+            return None
+
+    def _near_match(self, text: str):
+        """
+        Returns the vector of a recently cached text that is nearly identical to the text:
+        equal after normalization (a dict lookup), or else above the fuzzy threshold.
+        Both are disabled unless fuzzy_threshold is set.
+        """
+        if self.fuzzy_threshold is None:
+            return None
+        normalized = self._normalize(text)
+        key = self._recent.get(normalized)
+        if key is not None and key in self._memory:
+            return self._memory[key]
+        for recent_text, key in reversed(self._recent.items()):
+            if fuzz.ratio(normalized, recent_text) > self.fuzzy_threshold and key in self._memory:
+                return self._memory[key]
+        return None
+
+    def put(self, text: str, vector: np.ndarray):
+        """
+        Stores the embedding of the text.
+        """
+        self.put_many([(text, vector)])
+
+    def put_many(self, items):
+        """
+        Stores several (text, embedding) pairs with a single write to the SQLite file.
+        """
+        rows = []
+        with self._lock:
+            for text, vector in items:
+                if not text or not isinstance(text, str):
+                    continue
+                key = self._key(text)
+                self._remember(key, vector)
+                if self.fuzzy_threshold is not None:
+                    normalized = self._normalize(text)
+                    self._recent[normalized] = key
+                    self._recent.move_to_end(normalized)
+                    if len(self._recent) > self.recent:
+                        self._recent.popitem(last=False)
+                rows.append((key, np.asarray(vector, dtype=np.float32).tobytes()))
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                )
+                self._db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The share of lookups answered from the cache (exact or fuzzy).
+        """
+        lookups = self.hits + self.near_hits + self.misses
+        return (self.hits + self.near_hits) / lookups if lookups else 0.0
+
+    @property
+    def miss_rate(self) -> float:
+        """
+        The share of lookups that required a request to the embedding endpoint.
+        """
+        lookups = self.hits + self.near_hits + self.misses
+        return self.misses / lookups if lookups else 0.0
+
+    def close(self):
+        """
+        Logs the hit statistics and closes the SQLite file.
+        """
+        logger.info(
+            "Embedding cache: %d hits, %d near hits, %d misses (hit rate %.1f%%, miss rate %.1f%%).",
+            self.hits, self.near_hits, self.misses, self.hit_rate * 100, self.miss_rate * 100,
+        )
+        if self._db is not None:
+            self._db.close()
+            self._db = None
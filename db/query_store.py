@@ -6,14 +6,23 @@ and generate SQL statements dynamically by substituting parameters into predefin
 
 Features:
 - Centralized management of SQL query templates for various database operations.
-- Dynamic SQL generation by substituting parameters into predefined templates.
+- Dynamic SQL generation by substituting identifiers into predefined templates.
 - Support for common operations like insert, update, delete, and search.
 - Index creation for optimizing database queries.
 
+- Parameterized templates that are prepared once per connection (PREPARE/EXECUTE).
+
 Author: Patrick Scheich
 Date: 2025-03-28
 """
 
+import re
+from functools import lru_cache
+
+_PARAM_PATTERN = re.compile(r"%\((\w+)\)s")
+_INSERT_PATTERN = re.compile(r"INSERT INTO (\w+) \(([^)]*)\)")
+_DISTANCE_OPERATOR = "{distance_operator}"
+
 
 class QueryStore:
     """
@@ -33,15 +42,23 @@ class QueryStore:
     and format a specific SQL query by providing the query name and the required parameters.
     """
 
+    # Distance metric -> (pgvector operator, operator class suffix). Queries only use an
+    # index built with the operator class that matches their operator.
+    DISTANCE_METRICS = {
+        "cosine": ("<=>", "cosine_ops"),
+        "l2": ("<->", "l2_ops"),
+        "ip": ("<#>", "ip_ops"),
+    }
+
     SQL_TEMPLATES = {
         # ===== TABLE CREATION =================================
         "create_jira_issue_table": """
         CREATE TABLE jira_issue (
             key TEXT PRIMARY KEY,
             summary TEXT NOT NULL,
-            summary_vector VECTOR(1024),
+            summary_vector {vector_type}(1024),
             description TEXT,
-            description_vector VECTOR(1024),
+            description_vector {vector_type}(1024),
             issue_type TEXT,
             status TEXT,
             status_category TEXT,
@@ -60,9 +77,9 @@ class QueryStore:
             key TEXT NOT NULL,
             parent_key TEXT,
             summary TEXT NOT NULL,
-            summary_vector VECTOR(1024),
+            summary_vector {vector_type}(1024),
             description TEXT,
-            description_vector VECTOR(1024),
+            description_vector {vector_type}(1024),
             status TEXT,
             status_category TEXT,
             assignee TEXT,
@@ -78,9 +95,9 @@ class QueryStore:
             key TEXT NOT NULL,
             parent_key TEXT,
             summary TEXT NOT NULL,
-            summary_vector VECTOR(1024),
+            summary_vector {vector_type}(1024),
             description TEXT,
-            description_vector VECTOR(1024),
+            description_vector {vector_type}(1024),
             issue_type TEXT,
             status TEXT,
             status_category TEXT,
@@ -99,9 +116,9 @@ class QueryStore:
             key TEXT NOT NULL,
             parent_key TEXT,
             summary TEXT NOT NULL,
-            summary_vector VECTOR(1024),
+            summary_vector {vector_type}(1024),
             description TEXT,
-            description_vector VECTOR(1024),
+            description_vector {vector_type}(1024),
             issue_type TEXT,
             status TEXT,
             status_category TEXT,
@@ -113,19 +130,6 @@ class QueryStore:
             time_spent_seconds INT,
             url TEXT
         );""",
-        # ===== TABLE DELETION ================================
-        "delete_jira_issue": """
-        DELETE FROM jira_issue WHERE key = '{key}';
-        """,
-        "delete_jira_subtask": """
-        DELETE FROM jira_subtask WHERE key = '{key}';
-        """,
-        "delete_jira_task": """
-        DELETE FROM jira_task WHERE key = '{key}';
-        """,
-        "delete_jira_bug": """
-        DELETE FROM jira_bug WHERE key = '{key}';
-        """,
         # ===== TABLE DROP ===============================
         "drop_jira_issue_table": """
         DROP TABLE IF EXISTS jira_issue;
@@ -139,53 +143,271 @@ class QueryStore:
         "drop_jira_bug_table": """
         DROP TABLE IF EXISTS jira_bug;
         """,
-        # ===== INSERTION ==================================
+        # ===== INDEX CREATION ==================================
+        "create_hnsw_index": """
+        CREATE INDEX IF NOT EXISTS {table}_{column}_hnsw ON {table}
+        USING hnsw ({column} {vector_type}_{opclass}) WITH (m = {m}, ef_construction = {ef_construction});
+        """,
+        "create_btree_index": """
+        CREATE INDEX IF NOT EXISTS {table}_{column}_idx ON {table} ({column});
+        """,
+        "create_ivfflat_index": """
+        CREATE INDEX IF NOT EXISTS {table}_{column}_ivfflat ON {table}
+        USING ivfflat ({column} {vector_type}_{opclass}) WITH (lists = {lists});
+        """,
+        "drop_hnsw_index": """
+        DROP INDEX IF EXISTS {table}_{column}_hnsw;
+        """,
+        "drop_ivfflat_index": """
+        DROP INDEX IF EXISTS {table}_{column}_ivfflat;
+        """,
+        # ===== MIGRATION ======================================
+        "alter_vector_column_type": """
+        ALTER TABLE {table} ALTER COLUMN {column} TYPE {vector_type}(1024) USING {column}::{vector_type}(1024);
+        """,
+    }
+
+    # Templates with psycopg2-style named parameters. They are sent to the server once
+    # per connection as prepared statements and executed with bound values afterwards,
+    # so the server skips parsing and planning on every call.
+    # {distance_operator} is replaced by the operator of the client's distance metric
+    # when the statement is prepared.
+    PREPARED_TEMPLATES = {
         "insert_jira_issue": """
-        INSERT INTO jira_issue (key, summary, summary_vector, description, description_vector, issue_type, status, 
+        INSERT INTO jira_issue (key, summary, summary_vector, description, description_vector, issue_type, status,
         status_category, project, assignee, reporter, created, updated, time_spent_seconds, url)
-        VALUES ('{key}', '{summary}', '{summary_vector}', '{description}', '{description_vector}', '{issue_type}', 
-        '{status}', '{status_category}', '{project}', '{assignee}', '{reporter}', '{created}', '{updated}', 
-        {time_spent_seconds}, '{url}');
+        VALUES (%(key)s, %(summary)s, %(summary_vector)s, %(description)s, %(description_vector)s, %(issue_type)s,
+        %(status)s, %(status_category)s, %(project)s, %(assignee)s, %(reporter)s, %(created)s, %(updated)s,
+        %(time_spent_seconds)s, %(url)s)
         """,
         "insert_jira_subtask": """
-        INSERT INTO jira_subtask (key, parent_key, summary, summary_vector, description, description_vector, status, status_category, assignee, 
-        created, updated, time_spent_seconds, url)
-        VALUES ('{key}', '{parent_key}', '{summary}', '{summary_vector}', '{description}', '{description_vector}', '{status}', '{status_category}', 
-        '{assignee}', '{created}', '{updated}', {time_spent_seconds}, '{url}');
-        ""","insert_jira_task": """
+        INSERT INTO jira_subtask (key, parent_key, summary, summary_vector, description, description_vector, status,
+        status_category, assignee, created, updated, time_spent_seconds, url)
+        VALUES (%(key)s, %(parent_key)s, %(summary)s, %(summary_vector)s, %(description)s, %(description_vector)s,
+        %(status)s, %(status_category)s, %(assignee)s, %(created)s, %(updated)s, %(time_spent_seconds)s, %(url)s)
+        """,
+        "insert_jira_task": """
         INSERT INTO jira_task (key, parent_key, summary, summary_vector, description, description_vector, issue_type,
         status, status_category, project, assignee, reporter, created, updated, time_spent_seconds, url)
-        VALUES ('{key}', '{parent_key}', '{summary}', '{summary_vector}', '{description}', '{description_vector}', 
-        '{issue_type}', '{status}', '{status_category}', '{project}', '{assignee}', '{reporter}', '{created}', 
-        '{updated}', {time_spent_seconds}, '{url}');
+        VALUES (%(key)s, %(parent_key)s, %(summary)s, %(summary_vector)s, %(description)s, %(description_vector)s,
+        %(issue_type)s, %(status)s, %(status_category)s, %(project)s, %(assignee)s, %(reporter)s, %(created)s,
+        %(updated)s, %(time_spent_seconds)s, %(url)s)
         """,
         "insert_jira_bug": """
         INSERT INTO jira_bug (key, summary, summary_vector, description, description_vector, issue_type,
         status, status_category, project, assignee, reporter, created, updated, time_spent_seconds, url)
-        VALUES ('{key}', '{summary}', '{summary_vector}', '{description}', '{description_vector}', '{issue_type}', 
-        '{status}', '{status_category}', '{project}', '{assignee}', '{reporter}', '{created}', '{updated}', 
-        {time_spent_seconds}, '{url}');
+        VALUES (%(key)s, %(summary)s, %(summary_vector)s, %(description)s, %(description_vector)s, %(issue_type)s,
+        %(status)s, %(status_category)s, %(project)s, %(assignee)s, %(reporter)s, %(created)s, %(updated)s,
+        %(time_spent_seconds)s, %(url)s)
         """,
-        # ===== INDEX CREATION ==================================
+        # ===== TABLE DELETION ================================
+        "delete_jira_issue": """
+        DELETE FROM jira_issue WHERE key = %(key)s
+        """,
+        "delete_jira_subtask": """
+        DELETE FROM jira_subtask WHERE key = %(key)s
+        """,
+        "delete_jira_task": """
+        DELETE FROM jira_task WHERE key = %(key)s
+        """,
+        "delete_jira_bug": """
+        DELETE FROM jira_bug WHERE key = %(key)s
+        """,
+        # ===== LOOKUP =========================================
         "issue_exists": """
         SELECT EXISTS(
-            SELECT 1 FROM jira_issue WHERE key = '{key}'
+            SELECT 1 FROM jira_issue WHERE key = %(key)s
             UNION ALL
-            SELECT 1 FROM jira_bug WHERE key = '{key}'
+            SELECT 1 FROM jira_bug WHERE key = %(key)s
             UNION ALL
-            SELECT 1 FROM jira_task WHERE key = '{key}'
-        );
+            SELECT 1 FROM jira_task WHERE key = %(key)s
+        )
+        """,
+        "existing_issue_keys": """
+        SELECT key FROM jira_issue WHERE key = ANY(%(keys)s::text[])
+        UNION
+        SELECT key FROM jira_bug WHERE key = ANY(%(keys)s::text[])
+        UNION
+        SELECT key FROM jira_task WHERE key = ANY(%(keys)s::text[])
+        """,
+        # ===== SIMILARITY SEARCH ==============================
+        "match_jira_task_description": """
+        SELECT key, parent_key, summary, description, issue_type, status, status_category, project, assignee,
+        reporter, created, updated, time_spent_seconds, url, description_vector {distance_operator} %(vector)s AS distance
+        FROM jira_task
+        ORDER BY description_vector {distance_operator} %(vector)s
+        LIMIT %(limit)s
+        """,
+        "match_jira_subtask_description": """
+        SELECT key, parent_key, summary, description, status, status_category, assignee, created, updated,
+        time_spent_seconds, url, description_vector {distance_operator} %(vector)s AS distance
+        FROM jira_subtask
+        ORDER BY description_vector {distance_operator} %(vector)s
+        LIMIT %(limit)s
+        """,
+        "match_jira_bug_description": """
+        SELECT key, summary, description, issue_type, status, status_category, project, assignee, reporter,
+        created, updated, time_spent_seconds, url, description_vector {distance_operator} %(vector)s AS distance
+        FROM jira_bug
+        ORDER BY description_vector {distance_operator} %(vector)s
+        LIMIT %(limit)s
+        """,
+        "match_jira_task_and_subtask_summary": """
+        SELECT key, parent_key, summary, description, issue_type, status, status_category, project, assignee,
+        reporter, created, updated, time_spent_seconds, url, distance
+        FROM (
+            (SELECT key, parent_key, summary, description, issue_type, status, status_category, project,
+            assignee, reporter, created, updated, time_spent_seconds, url,
+            summary_vector {distance_operator} %(vector)s AS distance
+            FROM jira_task ORDER BY summary_vector {distance_operator} %(vector)s LIMIT %(limit)s)
+            UNION ALL
+            (SELECT key, parent_key, summary, description, NULL, status, status_category, NULL,
+            assignee, NULL, created, updated, time_spent_seconds, url,
+            summary_vector {distance_operator} %(vector)s AS distance
+            FROM jira_subtask ORDER BY summary_vector {distance_operator} %(vector)s LIMIT %(limit)s)
+        ) AS combined_tasks
+        ORDER BY distance
+        LIMIT %(limit)s
         """,
     }
 
+    # The get_* helpers below depend only on their (hashable) arguments and the
+    # templates, which never change at runtime, so their results are memoized.
     @staticmethod
+    @lru_cache(maxsize=128)
     def get_sql(query_name, **params):
         """
         Retrieves and formats a SQL query template by substituting parameters into the template.
+        Only identifiers (table, column and type names) and integers may be substituted;
+        values belong in PREPARED_TEMPLATES, where they are bound by the driver.
         Returns the formatted SQL query string.
         Raises:
-            ValueError: If the query name is not found in the SQL_TEMPLATES dictionary.
+            ValueError: If the query name is not found in the SQL_TEMPLATES dictionary,
+                or if a parameter is neither an identifier nor an integer.
         """
+        for name, value in params.items():
+            if not isinstance(value, int) and not str(value).isidentifier():
+                raise ValueError(
+                    f"Parameter '{name}' of query '{query_name}' must be an identifier or an integer."
+                )
         if query_name in QueryStore.SQL_TEMPLATES:
             return QueryStore.SQL_TEMPLATES[query_name].format(**params)
         raise ValueError(f"Query '{query_name}' not found in QueryStore.")
+
+    @staticmethod
+    def is_prepared(query_name) -> bool:
+        """
+        Returns True if the query is available as a prepared statement template.
+        """
+        return query_name in QueryStore.PREPARED_TEMPLATES
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_param_names(query_name) -> tuple:
+        """
+        Returns the parameter names of a prepared statement template in positional order.
+        Raises:
+            ValueError: If the query name is not found in the PREPARED_TEMPLATES dictionary.
+        """
+        if query_name not in QueryStore.PREPARED_TEMPLATES:
+            raise ValueError(f"Prepared query '{query_name}' not found in QueryStore.")
+        return tuple(dict.fromkeys(_PARAM_PATTERN.findall(QueryStore.PREPARED_TEMPLATES[query_name])))
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_statement_name(query_name, distance_metric="cosine"):
+        """
+        Returns the server-side name of a prepared statement. Templates that compare
+        vectors are prepared once per distance metric, under the metric-suffixed name.
+        Raises:
+            ValueError: If the query or the distance metric is unknown.
+        """
+        if query_name not in QueryStore.PREPARED_TEMPLATES:
+            raise ValueError(f"Prepared query '{query_name}' not found in QueryStore.")
+        if _DISTANCE_OPERATOR not in QueryStore.PREPARED_TEMPLATES[query_name]:
+            return query_name
+        if distance_metric not in QueryStore.DISTANCE_METRICS:
+            raise ValueError(f"Unknown distance metric '{distance_metric}'.")
+        return f"{query_name}_{distance_metric}"
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_prepare_sql(query_name, distance_metric="cosine"):
+        """
+        Returns the PREPARE statement for a prepared statement template, with the
+        named parameters replaced by positional ($1, $2, ...) placeholders and the
+        distance operator of the given metric filled in.
+        """
+        statement_name = QueryStore.get_statement_name(query_name, distance_metric)
+        positions = {name: index for index, name in enumerate(QueryStore.get_param_names(query_name), 1)}
+        body = _PARAM_PATTERN.sub(
+            lambda match: f"${positions[match.group(1)]}",
+            QueryStore.PREPARED_TEMPLATES[query_name],
+        )
+        if statement_name != query_name:
+            body = body.replace(_DISTANCE_OPERATOR, QueryStore.DISTANCE_METRICS[distance_metric][0])
+        return f"PREPARE {statement_name} AS {body.strip()}"
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_execute_sql(query_name, distance_metric="cosine"):
+        """
+        Returns the EXECUTE statement for a prepared statement template with one
+        psycopg2 placeholder per parameter.
+        """
+        statement_name = QueryStore.get_statement_name(query_name, distance_metric)
+        placeholders = ", ".join(["%s"] * len(QueryStore.get_param_names(query_name)))
+        return f"EXECUTE {statement_name} ({placeholders})"
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_bulk_sql(query_name) -> tuple:
+        """
+        Splits a prepared INSERT template into a multi-row statement for
+        psycopg2.extras.execute_values and the matching per-row template.
+        Returns:
+            tuple: (INSERT statement with a single "VALUES %s" placeholder,
+                row template with named parameters)
+        Raises:
+            ValueError: If the query is unknown or not an INSERT ... VALUES statement.
+        """
+        if query_name not in QueryStore.PREPARED_TEMPLATES:
+            raise ValueError(f"Prepared query '{query_name}' not found in QueryStore.")
+        head, separator, values = QueryStore.PREPARED_TEMPLATES[query_name].partition("VALUES")
+        if not separator:
+            raise ValueError(f"Query '{query_name}' is not an INSERT ... VALUES statement.")
+        return f"{head.strip()} VALUES %s", values.strip().rstrip(";")
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_copy_sql(query_name) -> tuple:
+        """
+        Derives a binary COPY statement from a prepared INSERT template.
+        Returns:
+            tuple: (COPY ... FROM STDIN WITH (FORMAT BINARY) statement, table name,
+                column names in COPY order)
+        Raises:
+            ValueError: If the query is unknown or not an INSERT INTO table (columns) statement.
+        """
+        if query_name not in QueryStore.PREPARED_TEMPLATES:
+            raise ValueError(f"Prepared query '{query_name}' not found in QueryStore.")
+        match = _INSERT_PATTERN.search(QueryStore.PREPARED_TEMPLATES[query_name])
+        if not match:
+            raise ValueError(f"Query '{query_name}' is not an INSERT INTO ... (columns) statement.")
+        table = match.group(1)
+        columns = tuple(column.strip() for column in match.group(2).split(","))
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT BINARY)"
+        return sql, table, columns
+
+    @staticmethod
+    def get_params(query_name, **params) -> tuple:
+        """
+        Orders the given keyword parameters to match the positional parameters of a
+        prepared statement template.
+        Raises:
+            ValueError: If a required parameter is missing.
+        """
+        missing = [name for name in QueryStore.get_param_names(query_name) if name not in params]
+        if missing:
+            raise ValueError(f"Missing parameters for query '{query_name}': {', '.join(missing)}")
+        return tuple(params[name] for name in QueryStore.get_param_names(query_name))
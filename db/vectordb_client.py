@@ -10,6 +10,7 @@ Features:
 - Dependency injection for the embedding model.
 - Parameterized vector dimensions.
 - Resource management for database connections.
+- Connection pools shared by all clients of the same database.
 - Logging for better traceability.
 - Error handling for robustness.
 
@@ -18,17 +19,87 @@ Date: 2025-03-28
 """
 
 import os
+import struct
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Tuple, Union
+from uuid import uuid4
 
 from dotenv import load_dotenv
+import numpy as np
+import orjson
 import psycopg2
-from openai import AzureOpenAI
+from psycopg2.extensions import connection, register_adapter
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from openai import AzureOpenAI, RateLimitError
 from pgvector.psycopg2 import register_vector
 
+from db import binary_copy
+from db.embedding_cache import EmbeddingCache
 from db.query_store import QueryStore
 
 from lib.logger import logger
 
+EMBEDDING_MODEL = "text-embedding-3-large"
+EMBEDDING_DIMENSIONS = 1024
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_MAX_RETRIES = 5
+BULK_PAGE_SIZE = 500
+# Batches larger than this are loaded with COPY ... (FORMAT BINARY) instead of execute_values.
+COPY_THRESHOLD = 256
+# Rows fetched per round-trip by server-side cursors.
+STREAM_ITERSIZE = 2000
+# psycopg2 pools keep at most POOL_MIN_CONNECTIONS idle connections; connections opened
+# beyond that under concurrent use are closed again when they are returned.
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 8
+# Column types for the embeddings: "halfvec" stores 2 bytes per dimension instead of 4.
+VECTOR_PRECISIONS = ("vector", "halfvec")
+# Vector index types: "auto" picks HNSW or IVFFlat by table size, "flat" means no index
+# (exact search).
+INDEX_TYPES = ("auto", "hnsw", "ivfflat", "flat")
+# Upper bound of (estimated) tokens sent in one embeddings request.
+_BATCH_TOKENS = 250_000
+
+# Connection pools shared by all VectorDB instances with the same connection parameters.
+_POOLS = {}
+_POOL_USERS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _release_pool(pool_key):
+    """
+    Drops one user of a shared connection pool and closes the pool's connections
+    once no VectorDB instance uses it anymore.
+    """
+    with _POOLS_LOCK:
+        _POOL_USERS[pool_key] -= 1
+        if not _POOL_USERS[pool_key]:
+            del _POOL_USERS[pool_key]
+            _POOLS.pop(pool_key).closeall()
+            logger.info("Database connection closed.")
+
+
+class PooledConnection(connection):
+    """
+    A pooled connection that remembers the session state set up on it
+    (registered types, prepared statements, settings), since that state lives
+    as long as the server session and not as long as a VectorDB instance.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.vector_registered = False
+        self.prepared = set()
+        self.ef_search = None
+        self.ivf_probes = None
+
 
 @dataclass
 class DBConfig:
@@ -42,6 +113,27 @@ class DBConfig:
         port (int): The port number for the database connection (optional).
         embedding_model (object): The embedding model to use (optional).
         vector_dim (int): The dimension of the vector embeddings (default is 3072).
+        hnsw_ef_search (int): The HNSW candidate list size used by similarity queries
+            (40 favours speed, 100-200 favour recall).
+        vector_precision (str): The column type of new embedding columns, "vector" (float32,
+            default) or "halfvec" (float16, requires pgvector 0.7+). Existing tables are
+            converted with db.migrate_vector_precision(client, "halfvec").
+        embedding_cache (EmbeddingCache): The cache for computed embeddings (optional,
+            defaults to an in-memory cache). A cache passed in is not closed by the client.
+        embedding_cache_path (str): The SQLite file of the default embedding cache, which
+            keeps embeddings across runs so unchanged texts are not embedded again on the
+            next sync (optional, memory only if omitted).
+        index_type (str): The vector index type, one of INDEX_TYPES. "auto" builds IVFFlat
+            indexes for tables of more than a million rows (static bulk loads, faster to
+            build) and HNSW indexes otherwise (better recall, cheap incremental inserts).
+        ivf_lists (int): The number of IVFFlat lists (optional, derived from the row count).
+        ivf_probes (int): The number of IVFFlat lists searched by similarity queries.
+        hnsw_m (int): The HNSW links per node (optional, derived from the row count).
+        hnsw_ef_construction (int): The HNSW build candidate list size (optional,
+            derived from the row count).
+        distance_metric (str): The similarity metric of queries and indexes, one of
+            QueryStore.DISTANCE_METRICS. "ip" (negative inner product) equals cosine distance
+            for the L2-normalized embeddings of create_embedding and skips the norm computation.
     """
 
     dbname: str
@@ -51,6 +143,16 @@ class DBConfig:
     port: int = None
     embedding_model: object = None
     vector_dim: int = 3072
+    hnsw_ef_search: int = 40
+    vector_precision: str = "vector"
+    embedding_cache: EmbeddingCache = None
+    embedding_cache_path: str = None
+    index_type: str = "auto"
+    ivf_lists: int = None
+    ivf_probes: int = 10
+    hnsw_m: int = None
+    hnsw_ef_construction: int = None
+    distance_metric: str = "cosine"
 
 
 class VectorDB:
@@ -70,12 +172,28 @@ class VectorDB:
         load_dotenv()
         if not config.dbname.isidentifier():
             raise ValueError("The database name must be a valid identifier.")
+        if config.vector_precision not in VECTOR_PRECISIONS:
+            raise ValueError(f"The vector precision must be one of {', '.join(VECTOR_PRECISIONS)}.")
+        if config.index_type not in INDEX_TYPES:
+            raise ValueError(f"The index type must be one of {', '.join(INDEX_TYPES)}.")
+        if config.distance_metric not in QueryStore.DISTANCE_METRICS:
+            raise ValueError(
+                f"The distance metric must be one of {', '.join(QueryStore.DISTANCE_METRICS)}."
+            )
         self.dbname = config.dbname
         self.user = config.user
         self.password = config.password
         self.host = config.host
         self.port = config.port
         self.vector_dim = config.vector_dim
+        self.hnsw_ef_search = config.hnsw_ef_search
+        self.vector_precision = config.vector_precision
+        self.index_type = config.index_type
+        self.ivf_lists = config.ivf_lists
+        self.ivf_probes = config.ivf_probes
+        self.hnsw_m = config.hnsw_m
+        self.hnsw_ef_construction = config.hnsw_ef_construction
+        self.distance_metric = config.distance_metric
 
         self.embedding_api_key = os.getenv("AZURE_OPENAI_API_KEY")
         if not self.embedding_api_key:
@@ -95,10 +213,38 @@ class VectorDB:
         else:
             self.embedding_model = config.embedding_model
 
-        self.conn = None
-        self.cursor = None
+        # An injected cache may be shared with other clients, so only an own cache is closed.
+        self._owns_cache = config.embedding_cache is None
+        self.embedding_cache = config.embedding_cache or EmbeddingCache(
+            EMBEDDING_MODEL, EMBEDDING_DIMENSIONS, path=config.embedding_cache_path
+        )
+
+        self._dsn = {
+            "dbname": self.dbname,
+            "user": self.user,
+            "password": self.password,
+            "host": self.host,
+        }
+        if self.port:
+            self._dsn["port"] = self.port
+        self._pool = None
+        self._pool_key = None
+        self._pool_finalizer = None
+        self._local = threading.local()
         self._connect_to_postgres()
-        register_vector(self.conn)
+        try:
+            with self._conn():
+                pass
+        except psycopg2.Error as e:
+            logger.error("Error while initializing the database connection: %s", e)
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def setup(self):
         """
@@ -124,64 +270,146 @@ class VectorDB:
             logger.error("Error creating extension or table: %s", e)
             raise
 
-    def create_embedding(self, text: str):
+    def create_embedding(self, text: Union[str, List[str]]):
         """
         Creates an embedding for the given text using the specified embedding model.
         Args:
-            text (str): The text to be embedded.
+            text (str | list[str]): The text to be embedded, or a list of texts which
+                are embedded in as few requests as the token budget allows.
         Returns:
-            list: The embedding vector for the text.
+            np.ndarray: The L2-normalized float32 embedding of the text, or an array of shape
+                (len(text), EMBEDDING_DIMENSIONS) for a list of texts.
         Raises:
             ValueError: If the text is empty or None.
         """
+        if isinstance(text, list):
+            vectors = self._embed_cached(text)
+            if not vectors:
+                return np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+            return np.stack(vectors)
+
         if not text or not isinstance(text, str):
             logger.error("Invalid text input: %s", text)
 
-        embedding = self.embedding_model.embeddings.create(
-            model="text-embedding-3-large",
-            input=[
-                text,
-            ],
-            dimensions=1024,
-        )
+        return self._embed_cached([text])[0]
 
-        return embedding.data[0].embedding
+    def _embed_cached(self, texts: List[str]) -> list:
+        """
+        Looks up every text in the embedding cache and embeds only the misses,
+        batched by the token budget.
+        """
+        vectors = [self.embedding_cache.get(text) for text in texts]
+        missing = [text for text, vector in zip(texts, vectors) if vector is None]
+        if not missing:
+            return vectors
+
+        embedded = [
+            vector
+            for batch in _split_by_tokens(missing)
+            for vector in self._embed(batch)
+        ]
+        self.embedding_cache.put_many(zip(missing, embedded))
+        embedded = iter(embedded)
+        return [next(embedded) if vector is None else vector for vector in vectors]
+
+    def create_embeddings(self, texts: list, batch: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+        """
+        Creates embeddings for a list of texts, sending one request per batch
+        instead of one request per text.
+        Args:
+            texts (list[str]): The texts to be embedded.
+            batch (int): The maximum number of texts per request (the API accepts up to 2048).
+        Returns:
+            np.ndarray: A float32 array of shape (len(texts), EMBEDDING_DIMENSIONS),
+                in the same order as the input texts.
+        """
+        if not texts:
+            return np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        return np.concatenate([
+            self.create_embedding(list(texts[start:start + batch]))
+            for start in range(0, len(texts), batch)
+        ])
+
+    def create_embeddings_batched(
+        self, texts: Iterable[str], batch_size: int = 96
+    ) -> Iterator[Tuple[str, np.ndarray]]:
+        """
+        Lazily embeds a stream of texts in batches of batch_size.
+        Args:
+            texts (Iterable[str]): The texts to be embedded. Only one batch is held in memory.
+            batch_size (int): The number of texts per request.
+        Yields:
+            tuple: (text, embedding vector) pairs in input order.
+        """
+        iterator = iter(texts)
+        while batch := list(islice(iterator, batch_size)):
+            yield from zip(batch, self.create_embedding(batch))
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Sends one embeddings request and retries with exponential backoff when the
+        endpoint is rate limited.
+        Args:
+            texts (list[str]): The texts to be embedded in a single request.
+        Returns:
+            np.ndarray: The L2-normalized float32 embeddings in input order, one row per text.
+        Raises:
+            openai.RateLimitError: If the request is still rate limited after all retries.
+        """
+        for attempt in range(EMBEDDING_MAX_RETRIES):
+            try:
+                response = self.embedding_model.embeddings.create(
+                    model=EMBEDDING_MODEL,
+                    input=texts,
+                    dimensions=EMBEDDING_DIMENSIONS,
+                )
+                logger.debug("Embedded batch of %d texts.", len(response.data))
+                vectors = np.fromiter(
+                    (item.embedding for item in response.data),
+                    dtype=np.dtype((np.float32, EMBEDDING_DIMENSIONS)),
+                    count=len(response.data),
+                )
+                vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+                return vectors
+            except RateLimitError as e:
+                if attempt == EMBEDDING_MAX_RETRIES - 1:
+                    logger.error("Embedding request still rate limited after %d attempts.", attempt + 1)
+                    raise
+                delay = 2 ** attempt
+                logger.warning("Embedding request rate limited (%s), retrying in %ds.", e, delay)
+                time.sleep(delay)
+        return np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
 
     def _connect_to_postgres(self):
         """
-        Establishes a connection to a PostgreSQL database using the provided
-        credentials and connection parameters.
-        This method sets up a connection to the PostgreSQL database specified
-        by the instance attributes dbname, user, password, host, and port.
-        It also enables autocommit mode and initializes a cursor for executing
-        SQL queries.
+        Attaches to the connection pool for the configured database, creating the
+        pool on first use. Pools are shared by all VectorDB instances with the same
+        connection parameters, so short-lived clients skip the connection handshake.
         Raises:
             psycopg2.OperationalError: If the connection to the database fails.
         """
+        if self._pool is not None:
+            return
+        key = tuple(sorted(self._dsn.items()))
         try:
-            if self.port:
-                self.conn = psycopg2.connect(
-                    dbname="postgres",
-                    user=self.user,
-                    password=self.password,
-                    host=self.host,
-                    port=self.port,
-                )
-            else:
-                self.conn = psycopg2.connect(
-                    dbname=self.dbname,
-                    user=self.user,
-                    password=self.password,
-                    host=self.host,
-                )
-                self.conn.autocommit = True
-                self.cursor = self.conn.cursor()
-                # self.is_connected = True
-                logger.info(
-                    "Connection to the 'postgres' database successfully established."
-                )
+            with _POOLS_LOCK:
+                if key not in _POOLS:
+                    _POOLS[key] = ThreadedConnectionPool(
+                        POOL_MIN_CONNECTIONS,
+                        POOL_MAX_CONNECTIONS,
+                        connection_factory=PooledConnection,
+                        **self._dsn,
+                    )
+                    logger.info(
+                        "Connection pool for the '%s' database successfully established.", self.dbname
+                    )
+                _POOL_USERS[key] = _POOL_USERS.get(key, 0) + 1
+                self._pool = _POOLS[key]
+                self._pool_key = key
+            # Releases the pool if the instance is garbage collected without close().
+            self._pool_finalizer = weakref.finalize(self, _release_pool, key)
         except psycopg2.OperationalError as e:
-            logger.error("OperationalError: Unable to connect to 'postgres': %s", e)
+            logger.error("OperationalError: Unable to connect to '%s': %s", self.dbname, e)
             raise
         except psycopg2.InterfaceError as e:
             logger.error("InterfaceError: Issue with the database interface: %s", e)
@@ -190,6 +418,33 @@ class VectorDB:
             logger.error("DatabaseError: General database error occurred: %s", e)
             raise
 
+    @contextmanager
+    def _conn(self, register_types=True):
+        """
+        Yields a connection for one operation: the connection pinned by an open session()
+        or transaction() of this thread, or an autocommit connection borrowed from the pool.
+        Args:
+            register_types (bool): Whether to register the pgvector types on the connection,
+                which requires the vector extension to exist.
+        """
+        pinned_conn = getattr(self._local, "conn", None)
+        if pinned_conn is not None:
+            yield pinned_conn
+            return
+
+        conn = self._pool.getconn()
+        try:
+            if not conn.autocommit:
+                conn.autocommit = True
+            if register_types and not conn.vector_registered:
+                register_vector(conn)
+                # register_vector (re-)registers pgvector's ndarray adapter for all connections.
+                register_adapter(np.ndarray, _VectorLiteral)
+                conn.vector_registered = True
+            yield conn
+        finally:
+            self._pool.putconn(conn, close=bool(conn.closed))
+
     def _create_extension_and_table(self):
         """
         Creates the necessary extension and table for storing embeddings.
@@ -200,25 +455,155 @@ class VectorDB:
             psycopg2.Error: If an error occurs while creating the extension or table.
         """
         try:
-            self.cursor.execute("CREATE EXTENSION IF NOT EXISTS vector;")
-            self.conn.commit()
+            with self._conn(register_types=False) as conn, conn.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS vector;")
             logger.info("Extension has been created or already exists.")
         except psycopg2.ProgrammingError as e:
             logger.error("ProgrammingError while creating extension: %s", e)
-            self.conn.rollback()
             raise
         except psycopg2.IntegrityError as e:
             logger.error("IntegrityError while creating extension: %s", e)
-            self.conn.rollback()
             raise
         except psycopg2.DatabaseError as e:
             logger.error("DatabaseError while creating extension: %s", e)
-            self.conn.rollback()
             raise
 
+    @contextmanager
+    def transaction(self, synchronous_commit=True):
+        """
+        Runs all statements inside the context in one database transaction instead of
+        committing every statement on its own, so the WAL flush is paid once per batch.
+        The transaction is committed when the context exits normally and rolled back
+        if an exception is raised. Nested calls join the outer transaction.
+        Args:
+            synchronous_commit (bool): If False, the commit does not wait for the WAL flush
+                (SET LOCAL synchronous_commit = off). A server crash right after the commit
+                can lose the transaction, but never corrupts data; meant for bulk loads
+                that can be repeated.
+        Usage:
+            with client.transaction():
+                client.store_text(...)
+                client.store_text(...)
+        Raises:
+            psycopg2.Error: If the commit or rollback fails.
+        """
+        if getattr(self._local, "in_transaction", False):
+            yield self
+            return
+        with self.session(), self._conn() as conn:
+            conn.autocommit = False
+            self._local.in_transaction = True
+            try:
+                if not synchronous_commit:
+                    with conn.cursor() as cursor:
+                        cursor.execute("SET LOCAL synchronous_commit = off")
+                yield self
+                conn.commit()
+                logger.info("Transaction committed.")
+            except BaseException:
+                # Also covers GeneratorExit when a streaming generator is closed early.
+                conn.rollback()
+                logger.error("Transaction rolled back.")
+                raise
+            finally:
+                self._local.in_transaction = False
+                if not conn.closed:
+                    conn.autocommit = True
+
+    @contextmanager
+    def session(self):
+        """
+        Pins one pooled connection to the calling thread for the duration of the context,
+        so that session settings (SET ...) apply to every statement inside it.
+        Usage:
+            with client.session():
+                client.execute_sql("SET maintenance_work_mem = '2GB'")
+                client.execute_sql("CREATE INDEX ...")
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield self
+            return
+        with self._conn() as conn:
+            self._local.conn = conn
+            try:
+                yield self
+            finally:
+                self._local.conn = None
+
+    @staticmethod
+    def _ensure_prepared(cursor, statement_name, distance_metric="cosine"):
+        """
+        Prepares the statement on the cursor's connection if it has not been prepared yet.
+        Args:
+            cursor (psycopg2.extensions.cursor): A cursor of a pooled connection.
+            statement_name (str): The name of the prepared statement template in the QueryStore.
+            distance_metric (str): The distance metric whose operator is baked into the statement.
+        Raises:
+            psycopg2.Error: If the statement cannot be prepared.
+        """
+        server_name = QueryStore.get_statement_name(statement_name, distance_metric)
+        if server_name in cursor.connection.prepared:
+            return
+        cursor.execute(QueryStore.get_prepare_sql(statement_name, distance_metric))
+        cursor.connection.prepared.add(server_name)
+        logger.debug("Prepared statement '%s'.", server_name)
+
+    @classmethod
+    def _execute_prepared(cls, cursor, statement_name, params, distance_metric="cosine"):
+        """
+        Executes a prepared statement with the given parameters, preparing it on the
+        cursor's connection first if necessary.
+        Args:
+            cursor (psycopg2.extensions.cursor): A cursor of a pooled connection.
+            statement_name (str): The name of the prepared statement template in the QueryStore.
+            params (dict): The statement parameters by name.
+            distance_metric (str): The distance metric of similarity statements.
+        Raises:
+            ValueError: If a parameter is missing.
+            psycopg2.Error: If the statement cannot be prepared or executed.
+        """
+        cls._ensure_prepared(cursor, statement_name, distance_metric)
+        cursor.execute(
+            QueryStore.get_execute_sql(statement_name, distance_metric),
+            QueryStore.get_params(statement_name, **params),
+        )
+
+    @staticmethod
+    def _ensure_ef_search(cursor, ef_search):
+        """
+        Sets hnsw.ef_search for the session if it differs from the current value.
+        A session-level SET is used because SET LOCAL has no effect outside of an
+        explicit transaction, and the connections run in autocommit mode.
+        Args:
+            cursor (psycopg2.extensions.cursor): A cursor of a pooled connection.
+            ef_search (int): The HNSW candidate list size.
+        """
+        if ef_search == cursor.connection.ef_search:
+            return
+        cursor.execute("SET hnsw.ef_search = %s", (int(ef_search),))
+        cursor.connection.ef_search = ef_search
+        logger.debug("Set hnsw.ef_search to %d.", ef_search)
+
+    @staticmethod
+    def _ensure_ivf_probes(cursor, probes):
+        """
+        Sets ivfflat.probes for the session if it differs from the current value,
+        see _ensure_ef_search.
+        Args:
+            cursor (psycopg2.extensions.cursor): A cursor of a pooled connection.
+            probes (int): The number of IVFFlat lists to search.
+        """
+        if probes == cursor.connection.ivf_probes:
+            return
+        cursor.execute("SET ivfflat.probes = %s", (int(probes),))
+        cursor.connection.ivf_probes = probes
+        logger.debug("Set ivfflat.probes to %d.", probes)
+
     def store_text(self, statement_name, **columns):
         """
         Stores the text in the database using the provided SQL statement name and parameters.
+        Statements available in QueryStore.PREPARED_TEMPLATES are prepared once per
+        connection and executed with bound parameters.
         Args:
             statement_name (str): The name of the SQL statement to execute.
             **columns: The parameters to be passed to the SQL statement.
@@ -227,45 +612,162 @@ class VectorDB:
                 """
         # if not self.is_connected:
         #     raise RuntimeError("Database connection is not established. Call setup() first.")
-        sql_statement = QueryStore.get_sql(statement_name, **columns)
         try:
-            self.cursor.execute(sql_statement)
-            self.conn.commit()
+            with self._conn() as conn, conn.cursor() as cursor:
+                if QueryStore.is_prepared(statement_name):
+                    self._execute_prepared(cursor, statement_name, _as_vectors(columns), self.distance_metric)
+                else:
+                    cursor.execute(QueryStore.get_sql(statement_name, **columns))
             logger.info("Text stored successfully.")
         except psycopg2.ProgrammingError as e:
             logger.error("ProgrammingError while storing text: %s", e)
-            self.conn.rollback()
             raise
         except psycopg2.IntegrityError as e:
             logger.error("IntegrityError while storing text: %s", e)
-            self.conn.rollback()
             raise
         except psycopg2.DatabaseError as e:
             logger.error("DatabaseError while storing text: %s", e)
-            self.conn.rollback()
             raise
 
-    def get_matches(self, query, query_statement_name, limit=3):
+    def store_texts_bulk(self, statement_name, rows, page_size=BULK_PAGE_SIZE):
+        """
+        Stores many rows with one multi-row INSERT per page (psycopg2.extras.execute_values)
+        and a single commit, instead of one round-trip and one commit per row.
+        Batches of more than COPY_THRESHOLD rows are streamed with a binary COPY instead,
+        which sends the embeddings as raw floats rather than text the server has to parse.
+        Args:
+            statement_name (str): The name of the INSERT template in QueryStore.PREPARED_TEMPLATES.
+            rows (Iterable[dict]): The column values of each row, keyed like the store_text parameters.
+            page_size (int): The number of rows sent per statement.
+        Returns:
+            int: The number of rows stored.
+        Raises:
+            psycopg2.Error: If an error occurs while inserting; no row of the batch is stored.
+        """
+        sql, template = QueryStore.get_bulk_sql(statement_name)
+        rows = [_as_vectors(row) for row in rows]
+        if not rows:
+            return 0
+        try:
+            with self.transaction(), self._conn() as conn, conn.cursor() as cursor:
+                if not (len(rows) > COPY_THRESHOLD and self._copy_rows(cursor, statement_name, rows)):
+                    execute_values(cursor, sql, rows, template=template, page_size=page_size)
+            logger.info("Stored %d rows with '%s'.", len(rows), statement_name)
+            return len(rows)
+        except psycopg2.ProgrammingError as e:
+            logger.error("ProgrammingError while storing rows: %s", e)
+            raise
+        except psycopg2.IntegrityError as e:
+            logger.error("IntegrityError while storing rows: %s", e)
+            raise
+        except psycopg2.DatabaseError as e:
+            logger.error("DatabaseError while storing rows: %s", e)
+            raise
+
+    @staticmethod
+    def _copy_rows(cursor, statement_name, rows) -> bool:
+        """
+        Loads the rows with COPY ... FROM STDIN WITH (FORMAT BINARY).
+        Args:
+            cursor (psycopg2.extensions.cursor): A cursor inside a transaction.
+            statement_name (str): The name of the INSERT template in QueryStore.PREPARED_TEMPLATES.
+            rows (list[dict]): The column values of each row.
+        The rows are encoded before the COPY; a value the binary encoders cannot handle makes
+        the caller fall back to execute_values. The COPY runs under a savepoint: if the server
+        rejects it (e.g. a constraint or trigger the binary format cannot satisfy), the
+        savepoint is rolled back and the caller falls back as well. execute_values reports
+        the error if it persists.
+        Returns:
+            bool: False if nothing was stored, because a column type has no binary encoder,
+                a value could not be encoded or the COPY failed.
+        """
+        sql, table, columns = QueryStore.get_copy_sql(statement_name)
+        cursor.execute(
+            """
+            SELECT column_name, udt_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %(table)s
+            """,
+            {"table": table},
+        )
+        table_types = dict(cursor.fetchall())
+        column_types = tuple(table_types.get(column) for column in columns)
+        if not binary_copy.supports(column_types):
+            logger.debug("No binary COPY for '%s' (column types %s).", table, column_types)
+            return False
+        try:
+            stream = binary_copy.encode_rows(rows, columns, column_types)
+        except (KeyError, ValueError, TypeError, struct.error) as e:
+            logger.warning("Cannot encode rows for COPY into '%s', falling back to execute_values: %s",
+                           table, e)
+            return False
+        cursor.execute("SAVEPOINT bulk_copy")
+        try:
+            cursor.copy_expert(sql, stream)
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT bulk_copy")
+            logger.warning("COPY into '%s' failed, falling back to execute_values: %s", table, e)
+            return False
+        cursor.execute("RELEASE SAVEPOINT bulk_copy")
+        return True
+
+    def get_matches(
+        self, query, query_statement_name, limit=3, row_factory=None, ef_search=None, probes=None
+    ):
         """
         Finds the most similar texts to the given query based on their embeddings.
         Args:
             query (str): The query text for which to find similar texts.
+            query_statement_name (str): The name of the similarity query in the QueryStore.
             limit (int): The maximum number of similar texts to return.
+            row_factory (type): Optional psycopg2 cursor class (e.g. psycopg2.extras.RealDictCursor)
+                for callers that consume rows as dicts. Defaults to plain tuples, which avoids
+                allocating one dict per row.
+            ef_search (int): Optional HNSW candidate list size for this query
+                (defaults to DBConfig.hnsw_ef_search).
+            probes (int): Optional number of IVFFlat lists searched for this query
+                (defaults to DBConfig.ivf_probes).
         Returns:
             results (list): A list of tuples containing the text and similarity score.
         Raises:
             psycopg2.Error: If an error occurs while executing the database query.
         """
-        query_embedding = self.create_embedding(query)  # This returns a list/array
-
-        sql_statement = QueryStore.get_sql(
-            query_statement_name, vector=query_embedding, limit=limit
+        return self.get_matches_by_vector(
+            self.create_embedding(query), query_statement_name,
+            limit=limit, row_factory=row_factory, ef_search=ef_search, probes=probes,
         )
-        logger.debug("SQL statement: %s", sql_statement)
 
+    def get_matches_by_vector(
+        self, query_embedding, query_statement_name, limit=3, row_factory=None, ef_search=None,
+        probes=None,
+    ):
+        """
+        Finds the rows closest to an already computed embedding, so that one embedding
+        can be matched against several tables.
+        The embedding is bound as a pgvector parameter of a prepared statement instead of
+        being formatted into the SQL text as a literal.
+        Args:
+            query_embedding (list | np.ndarray): The query embedding.
+            query_statement_name (str): The name of the similarity query in QueryStore.PREPARED_TEMPLATES.
+            limit (int): The maximum number of rows to return.
+            row_factory (type): Optional psycopg2 cursor class, see get_matches.
+            ef_search (int): Optional HNSW candidate list size, see get_matches.
+            probes (int): Optional number of IVFFlat lists to search, see get_matches.
+        Returns:
+            results (list): The matching rows, closest first.
+        Raises:
+            psycopg2.Error: If an error occurs while executing the database query.
+        """
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        if self.distance_metric == "ip" and not np.isclose(np.linalg.norm(vector), 1.0, atol=1e-3):
+            raise ValueError("The inner product distance requires an L2-normalized query embedding.")
         try:
-            self.cursor.execute(sql_statement)
-            results = self.cursor.fetchall()
+            with self._conn() as conn, conn.cursor(cursor_factory=row_factory) as cursor:
+                self._ensure_ef_search(cursor, ef_search or self.hnsw_ef_search)
+                self._ensure_ivf_probes(cursor, probes or self.ivf_probes)
+                self._execute_prepared(
+                    cursor, query_statement_name, {"vector": vector, "limit": limit}, self.distance_metric
+                )
+                results = cursor.fetchall()
             return results
         except psycopg2.ProgrammingError as e:
             logger.error("ProgrammingError while retrieving matches: %s", e)
@@ -279,15 +781,18 @@ class VectorDB:
 
     def close(self):
         """
-        Closes the cursor and database connection.
+        Closes the embedding cache (unless it was passed in with DBConfig.embedding_cache)
+        and releases the connection pool. The pool's connections are closed once no other
+        VectorDB instance uses the pool.
+        Also called when leaving a `with VectorDB(config) as client:` block.
         """
+        if self._owns_cache:
+            self.embedding_cache.close()
+        if self._pool is None:
+            return
         try:
-            if self.cursor:
-                self.cursor.close()
-            if self.conn:
-                self.conn.close()
-            # self.is_connected = False
-            logger.info("Database connection closed.")
+            self._pool_finalizer()
+            self._pool = None
         except psycopg2.InterfaceError as e:
             logger.error("InterfaceError while closing resources: %s", e)
         except psycopg2.DatabaseError as e:
@@ -314,29 +819,27 @@ class VectorDB:
             psycopg2.Error: If an error occurs while describing the database.
         """
         try:
-            self.cursor.execute(
-                "SELECT table_name FROM information_schema.tables WHERE table_schema='public'"
-            )
-            tables = [table[0] for table in self.cursor.fetchall()]
-            self.cursor.execute("SELECT extname FROM pg_extension")
-            extensions = [extension[0] for extension in self.cursor.fetchall()]
-
-            table_details = []
-            for table in tables:
-                self.cursor.execute(
-                    f"""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_name = '{table}'
-                """
+            with self.transaction(), self._conn() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT extname FROM pg_extension")
+                extensions = [extension[0] for extension in cursor.fetchall()]
+
+                column_rows = self.stream_sql(
+                    """
+                    SELECT table_name, column_name, data_type
+                    FROM information_schema.columns
+                    WHERE table_schema = %(schema)s
+                    ORDER BY table_name, ordinal_position
+                    """,
+                    schema="public",
                 )
-                columns = self.cursor.fetchall()
-                table_details.append({"table_name": table, "columns": columns})
+                table_details = [
+                    {"table_name": table, "columns": [(column, data_type) for _, column, data_type in rows]}
+                    for table, rows in groupby(column_rows, key=itemgetter(0))
+                ]
             return {"tables": table_details, "extensions": extensions}
 
         except psycopg2.ProgrammingError as e:
             logger.error("ProgrammingError while describing the database: %s", e)
-            self.conn.rollback()
             raise
         except psycopg2.InterfaceError as e:
             logger.error("InterfaceError while describing the database: %s", e)
@@ -345,43 +848,137 @@ class VectorDB:
             logger.error("DatabaseError while describing the database: %s", e)
             raise
 
+    def stream_sql(self, sql_statement, itersize=STREAM_ITERSIZE, **sql_params):
+        """
+        Runs a SELECT through a named server-side cursor and yields its rows, fetching
+        itersize rows per round-trip instead of materializing the whole result in memory.
+        The statement runs inside a transaction (required by server-side cursors), which
+        stays open until the generator is exhausted or closed.
+        Args:
+            sql_statement (str): The SELECT statement, with %(name)s placeholders for sql_params.
+            itersize (int): The number of rows fetched per round-trip.
+            **sql_params: The parameters of the statement, bound by the driver.
+        Yields:
+            tuple: The result rows.
+        Raises:
+            psycopg2.Error: If an error occurs while executing the SQL statement.
+        """
+        try:
+            with self.transaction(), self._conn() as conn, \
+                    conn.cursor(name=f"cur_{uuid4().hex}") as cursor:
+                cursor.itersize = itersize
+                cursor.execute(sql_statement, _as_vectors(sql_params) or None)
+                yield from cursor
+        except psycopg2.ProgrammingError as e:
+            logger.error("ProgrammingError while streaming SQL statement: %s", e)
+            raise
+        except psycopg2.DatabaseError as e:
+            logger.error("DatabaseError while streaming SQL statement: %s", e)
+            raise
+
     def execute_sql(self, sql_statement, **sql_params):
         """
         Executes a given SQL statement.
         Args:
-            sql_statement (str): The SQL statement to execute.
+            sql_statement (str): The SQL statement to execute, or the name of a QueryStore query.
+            **sql_params: The parameters of the statement. They are bound by the driver for
+                prepared queries and for SQL text with %(name)s placeholders.
         Raises:
             psycopg2.Error: If an error occurs while executing the SQL statement.
         """
 
+        statement_name = None
+        params = _as_vectors(sql_params) or None
         if " " not in sql_statement.strip():
             logger.debug(
                 "SQL statement appears to be a key. Attempting to retrieve from QueryStore."
             )
-            sql_statement = QueryStore.get_sql(sql_statement, **sql_params)
+            if QueryStore.is_prepared(sql_statement):
+                statement_name = sql_statement
+                sql_statement = QueryStore.PREPARED_TEMPLATES[statement_name]
+            else:
+                sql_statement = QueryStore.get_sql(sql_statement, **sql_params)
+                params = None
         try:
-            self.cursor.execute(sql_statement)
-            if sql_statement.strip().lower().startswith("select"):
-                result = self.cursor.fetchall()
-                logger.info("SQL SELECT statement executed successfully.")
-                return result
-            self.conn.commit()
+            with self._conn() as conn, conn.cursor() as cursor:
+                if statement_name:
+                    self._execute_prepared(cursor, statement_name, params or {}, self.distance_metric)
+                else:
+                    cursor.execute(sql_statement, params)
+                if sql_statement.strip().lower().startswith("select"):
+                    result = cursor.fetchall()
+                    logger.info("SQL SELECT statement executed successfully.")
+                    return result
             logger.info("SQL statement executed successfully.")
             return None
         except psycopg2.ProgrammingError as e:
             logger.error("ProgrammingError while executing SQL statement: %s", e)
-            self.conn.rollback()
             raise
         except psycopg2.IntegrityError as e:
             logger.error("IntegrityError while executing SQL statement: %s", e)
-            self.conn.rollback()
             raise
         except psycopg2.DatabaseError as e:
             logger.error("DatabaseError while executing SQL statement: %s", e)
-            self.conn.rollback()
             raise
 
 
+def _estimate_tokens(text: str) -> int:
+    """
+    Cheap upper estimate of the token count of a text (roughly four characters per token).
+    """
+    return len(text or "") // 4 + 1
+
+
+def _split_by_tokens(texts: List[str]) -> Iterator[List[str]]:
+    """
+    Splits texts into consecutive batches whose estimated token count stays below _BATCH_TOKENS.
+    """
+    batch, tokens = [], 0
+    for text in texts:
+        text_tokens = _estimate_tokens(text)
+        if batch and tokens + text_tokens > _BATCH_TOKENS:
+            yield batch
+            batch, tokens = [], 0
+        batch.append(text)
+        tokens += text_tokens
+    if batch:
+        yield batch
+
+
+class _VectorLiteral:
+    """
+    Adapts numpy arrays to pgvector text literals for the statements that bind vectors as
+    parameters (queries, single inserts and execute_values batches). Replaces the pgvector
+    adapter, which formats every component with str(float(v)); orjson serializes the whole
+    array natively, with the shortest representation that round-trips float32.
+    """
+
+    def __init__(self, value):
+        self._value = value
+
+    def getquoted(self) -> bytes:
+        vector = np.ascontiguousarray(self._value, dtype=np.float32)
+        if vector.ndim != 1:
+            raise ValueError("expected ndim to be 1")
+        return b"'" + orjson.dumps(vector, option=orjson.OPT_SERIALIZE_NUMPY) + b"'"
+
+
+def _as_vectors(columns: dict) -> dict:
+    """
+    Converts list-valued vector columns (e.g. embeddings computed elsewhere) to float32
+    arrays so that they are bound through the pgvector adapter instead of as a numeric SQL array.
+    Rows without list-valued vectors (e.g. freshly embedded bulk rows) are returned as they
+    are, so a bulk insert does not copy every row.
+    """
+    if not any(isinstance(value, list) and name.endswith("vector") for name, value in columns.items()):
+        return columns
+    return {
+        name: np.asarray(value, dtype=np.float32)
+        if name.endswith("vector") and isinstance(value, list) else value
+        for name, value in columns.items()
+    }
+
+
 def format_output(string: str) -> str:
     """
     Formats the output string by replacing escape sequences with actual characters.
@@ -405,4 +1002,4 @@ if __name__ == "__main__":
 
     descr = client.describe_database()
 
-    res = client.get_matches("My computer does not boot", "query_servicedesk", limit=3)
+    res = client.get_matches("My computer does not boot", "match_jira_task_description", limit=3)
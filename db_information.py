@@ -17,14 +17,13 @@ PG_PWD = os.getenv("PG_PWD")
 if PG_PWD is None:
     raise ValueError("PG_PWD environment variable is not set.")
 
-client = VectorDB(
+with VectorDB(
     DBConfig(
         dbname="hackathon_ofa",
         user="hackathon_ofa",
         password=PG_PWD,
         host="hackathon-ofa.postgres.database.azure.com"
     )
-)
-
-res = client.describe_database()
+) as client:
+    res = client.describe_database()
 print(json.dumps(res, indent=4))
\ No newline at end of file
@@ -7,7 +7,8 @@ from .document_types import (
     AbstractPDFDocument,
     TechnicalDocumentation,
     AbstractImageDocument,
-    get_file_object
+    get_file_object,
+    get_file_objects
 )
 
 from .pdf_analyzing import (
@@ -31,6 +32,7 @@ __all__ = [
     "TechnicalDocumentation",
     "AbstractImageDocument",
     "get_file_object",
+    "get_file_objects",
     "PDFIngestApplication",
     "PDFContentGetter",
     "SectionProcessor",
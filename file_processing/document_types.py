@@ -1,12 +1,69 @@
 """Module to parse technical documentation file paths and extract metadata."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 import os
-from typing import Dict
+import re
+from typing import Dict, List
+import pikepdf
 from pydantic import BaseModel, Field
-from pypdf import PdfReader
 from PIL import Image
-from PIL.ExifTags import TAGS
+from PIL.ExifTags import IFD, Base
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+
+
+def _is_valid_date(value: str) -> bool:
+    """
+    Checks that a date string is a valid 'YYYY-MM-DD HH:MM:SS' timestamp.
+    The regex enforces the exact layout, datetime.fromisoformat (implemented in C)
+    the value ranges; both are much cheaper than datetime.strptime.
+    """
+    if not isinstance(value, str) or not _DATE_RE.match(value):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _parse_exif_date(value) -> datetime | None:
+    """
+    Parses an EXIF date ('YYYY:MM:DD HH:MM:SS') by slicing its fixed-position fields.
+    Returns None for missing or malformed values.
+    """
+    if not isinstance(value, str) or len(value) < 19:
+        return None
+    try:
+        return datetime(
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]),
+        )
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _format_pdf_date(date_str: str) -> str | None:
+    """
+    Converts a PDF date string ('D:YYYYMMDDHHmmSS...') to 'YYYY-MM-DD HH:MM:SS'.
+    The fields have fixed positions, so they are sliced out instead of going through
+    strptime/strftime. Memoized, since the same dates repeat within and across the
+    documents of a batch.
+    """
+    if date_str.startswith("D:"):
+        date_str = date_str[2:]
+    # Use the full date and time part: YYYYMMDDHHmmSS
+    digits = date_str[:14]
+    if len(digits) != 14 or not digits.isdigit():
+        return None
+    formatted = (
+        f"{digits[0:4]}-{digits[4:6]}-{digits[6:8]} {digits[8:10]}:{digits[10:12]}:{digits[12:14]}"
+    )
+    return formatted if _is_valid_date(formatted) else None
 
 
 class TechnicalDocumentationFilePathParser:
@@ -20,6 +77,8 @@ class TechnicalDocumentationFilePathParser:
             filepath (str): The full path to the file.
         """
         self.filepath = filepath
+        self._filename = os.path.basename(filepath)
+        self._ext = os.path.splitext(self._filename)[1][1:]
 
     def preprocess(self) -> str:
         """
@@ -28,7 +87,7 @@ class TechnicalDocumentationFilePathParser:
         Returns:
             str: The extracted filename.
         """
-        return self.filepath.split('/')[-1]
+        return self._filename
 
     def get_filename(self) -> str:
         """
@@ -37,7 +96,7 @@ class TechnicalDocumentationFilePathParser:
         Returns:
             str: The filename.
         """
-        return self.filepath.split('/')[-1]
+        return self._filename
 
     def get_file_extension(self) -> str:
         """
@@ -46,7 +105,7 @@ class TechnicalDocumentationFilePathParser:
         Returns:
             str: The file extension.
         """
-        return self.filepath.split('.')[-1]
+        return self._ext
 
 
 class BaseFileModel(BaseModel):
@@ -80,19 +139,52 @@ class TechnicalDocumentationFileData(BaseFileModel):
 class AbstractDocument:
     """Abstract document base class for handling file metadata."""
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, content: bytes | None = None) -> None:
         """
         Initializes the document by parsing the file path.
 
         Args:
             filepath (str): The full path to the document file.
+            content (bytes | None): The file content, if the document is held in memory.
         """
         parser = TechnicalDocumentationFilePathParser(filepath)
+        self.filepath: str = filepath
         self.filename: str = parser.preprocess()
+        self._ext: str = parser.get_file_extension()
+        self._content: bytes | None = content
         self.created: str | None = None
         self.modified: str | None = None
         self.path_attributes: BaseFileModel  # To be defined in subclass
 
+    @classmethod
+    def from_bytes(cls, name: str, content: bytes) -> "AbstractDocument":
+        """
+        Creates a document from content that is held in memory; nothing is read from disk.
+
+        Args:
+            name (str): The file name, used for the metadata and the file type.
+            content (bytes): The file content.
+
+        Returns:
+            AbstractDocument: The document, of the class matching the file type when
+            called on AbstractDocument itself.
+        """
+        if cls is AbstractDocument:
+            return get_file_object(name, content=content)
+        return cls(name, content=content)
+
+    def read(self) -> bytes:
+        """
+        Returns the file content, from memory if available and from disk otherwise.
+
+        Returns:
+            bytes: The file content.
+        """
+        if self._content is not None:
+            return self._content
+        with open(self.filepath, "rb") as f:
+            return f.read()
+
     def get_file_extension(self) -> str:
         """
         Returns the file extension of the document.
@@ -100,7 +192,7 @@ class AbstractDocument:
         Returns:
             str: The file extension.
         """
-        return self.filename.split('.')[-1]
+        return self._ext
 
     def get_path_attributes(self) -> BaseFileModel:
         """
@@ -118,12 +210,10 @@ class AbstractDocument:
         Args:
             created (str): The creation date in string format.
         """
-        try:
-            datetime.strptime(created, "%Y-%m-%d %H:%M:%S")
-        except ValueError as exc:
+        if not _is_valid_date(created):
             raise ValueError(
                 "The 'created' attribute must be in the format 'YYYY-MM-DD HH:MM:SS'."
-                ) from exc
+                )
         self.created = created
         self.path_attributes.created = created
 
@@ -134,12 +224,10 @@ class AbstractDocument:
         Args:
             modified (str): The modification date in string format.
         """
-        try:
-            datetime.strptime(modified, "%Y-%m-%d %H:%M:%S")
-        except ValueError as exc:
+        if not _is_valid_date(modified):
             raise ValueError(
                 "The 'modified' attribute must be in the format 'YYYY-MM-DD HH:MM:SS'."
-            ) from exc
+            )
         self.modified = modified
         self.path_attributes.modified = modified
 
@@ -147,20 +235,48 @@ class AbstractDocument:
 class AbstractPDFDocument(AbstractDocument):
     """Abstract class for handling PDF documents."""
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, content: bytes | None = None) -> None:
         """
         Initializes the PDF document by parsing the file path.
 
         Args:
             filepath (str): The full path to the PDF document file.
+            content (bytes | None): The PDF content, if the document is held in memory.
         """
-        super().__init__(filepath=filepath)
+        super().__init__(filepath=filepath, content=content)
         self.path_attributes = BaseFileModel(filename=self.filename)
+        if content is not None:
+            self._set_dates_from_pdf_metadata(self._read_pdf_info(BytesIO(content)))
+            return
         if not os.path.exists(filepath):
             return
-        self.reader = PdfReader(filepath)
 
-        self._set_dates_from_pdf_metadata()
+        self._set_dates_from_pdf_metadata(self._read_pdf_info(filepath))
+
+    @staticmethod
+    def _read_pdf_info(source: str | BytesIO) -> Dict[str, str]:
+        """
+        Reads only the creation and modification dates from the PDF's Info dictionary.
+
+        The file is parsed by QPDF (C++) through pikepdf and memory-mapped, so only the
+        trailer, the cross-reference table and the Info object are read from disk.
+
+        Args:
+            source (str | BytesIO): The full path to the PDF document file, or its content.
+
+        Returns:
+            Dict[str, str]: The '/CreationDate' and '/ModDate' entries that are present.
+        """
+        access_mode = (
+            pikepdf.AccessMode.mmap if isinstance(source, str) else pikepdf.AccessMode.default
+        )
+        with pikepdf.Pdf.open(source, access_mode=access_mode) as pdf:
+            docinfo = pdf.docinfo
+            return {
+                key: str(docinfo[key])
+                for key in ('/CreationDate', '/ModDate')
+                if key in docinfo
+            }
 
     @staticmethod
     def is_pdf(filepath: str) -> bool:
@@ -175,11 +291,13 @@ class AbstractPDFDocument(AbstractDocument):
         """
         return filepath.lower().endswith('.pdf')
 
-    def _set_dates_from_pdf_metadata(self) -> None:
+    def _set_dates_from_pdf_metadata(self, metadata: Dict[str, str]) -> None:
         """
         Extracts and sets the creation and modification dates from the PDF metadata.
+
+        Args:
+            metadata (Dict[str, str]): The PDF Info entries, see _read_pdf_info.
         """
-        metadata = self.reader.metadata
         if metadata:
             created = metadata.get('/CreationDate')
             if created:
@@ -203,13 +321,7 @@ class AbstractPDFDocument(AbstractDocument):
         Returns:
             str | None: The formatted date string or None if parsing fails.
         """
-        try:
-            if date_str.startswith("D:"):
-                date_str = date_str[2:]
-            # Use the full date and time part: YYYYMMDDHHmmSS
-            return datetime.strptime(date_str[:14], "%Y%m%d%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return None
+        return _format_pdf_date(str(date_str))
 
 
 class TechnicalDocumentation(AbstractPDFDocument):
@@ -220,23 +332,24 @@ class TechnicalDocumentation(AbstractPDFDocument):
         "ina": "Installationsanweisung",
     }
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, content: bytes | None = None) -> None:
         """
         Parses the filename and extracts structured metadata.
 
         Args:
             filepath (str): The full path to the technical documentation file.
+            content (bytes | None): The PDF content, if the document is held in memory.
 
         Raises:
             ValueError: If the file format does not contain all required parts.
         """
-        super().__init__(filepath=filepath)
+        super().__init__(filepath=filepath, content=content)
 
         file_parts = self.filename.split('_')
         if len(file_parts) < 4:
             raise ValueError(f"Invalid file format: {filepath}")
 
-        file_type = self.document_types.get(file_parts[1].lower(), "Unknown")
+        file_type = _doc_type(file_parts[1])
 
         self.path_attributes = TechnicalDocumentationFileData(
             article_number=file_parts[0],
@@ -258,45 +371,60 @@ class TechnicalDocumentation(AbstractPDFDocument):
             bool: True if the file is a technical documentation file, False otherwise.
         """
         filename = os.path.basename(filepath)
-        basic_requirements = len(filename.split('_')) >= 4 and filename.endswith('.pdf')
-        correct_type = basic_requirements and filename.split('_')[1].lower() in TechnicalDocumentation.document_types
-        return correct_type
+        if not filename.endswith('.pdf'):
+            return False
+        parts = filename.split('_', 3)
+        return len(parts) >= 4 and parts[1].lower() in TechnicalDocumentation.document_types
+
+
+@lru_cache(maxsize=64)
+def _doc_type(code: str) -> str:
+    """
+    Returns the document type for a filename code such as 'hdb' (case-insensitive).
+    Memoized, since a batch of files repeats the same few codes.
+    """
+    return TechnicalDocumentation.document_types.get(code.lower(), "Unknown")
     
 
 
 class AbstractImageDocument(AbstractDocument):
     """Abstract class for handling image documents."""
 
-    def __init__(self, filename: str):
-        super().__init__(filename)
+    def __init__(self, filename: str, content: bytes | None = None):
+        super().__init__(filename, content=content)
         self.created = None
         self.modified = None
 
-        if os.path.exists(filename):
+        stat = None
+        if content is None:
             try:
-                with Image.open(filename) as image:
-                    exif_data = image._getexif()  # pylint: disable=protected-access
-                    if exif_data:
-                        for tag, value in exif_data.items():
-                            tag_name = TAGS.get(tag, tag)
-                            if tag_name == "DateTimeOriginal":
-                                try:
-                                    self.created = datetime.strptime(
-                                        value, "%Y:%m:%d %H:%M:%S"
-                                    )
-                                except (ValueError, TypeError):
-                                    pass
-
-                if self.created is None:
-                    self.created = datetime.fromtimestamp(
-                        os.path.getctime(filename)
-                    )
-
-                self.modified = datetime.fromtimestamp(
-                    os.path.getmtime(filename)
-                )
+                # A single stat() serves as the existence check and provides both timestamps.
+                stat = os.stat(filename)
+            except OSError:
+                stat = None
 
-                self.width, self.height = image.size
+        if content is not None or stat is not None:
+            try:
+                with Image.open(BytesIO(content) if content is not None else filename) as image:
+                    # Image.open only parses the header; the size and EXIF block are read
+                    # from it without decoding the pixel data.
+                    self.width, self.height = image.size
+                    # PngImageFile.getexif() decodes the whole image to look for an eXIf
+                    # chunk behind the pixel data; only a chunk in front of it is used.
+                    if image.format != "PNG" or "exif" in image.info:
+                        # DateTimeOriginal belongs to the Exif sub-IFD; look it up directly
+                        # instead of decoding and scanning every tag.
+                        exif = image.getexif()
+                        self.created = _parse_exif_date(
+                            exif.get_ifd(IFD.Exif).get(Base.DateTimeOriginal)
+                            or exif.get(Base.DateTimeOriginal)
+                        )
+
+                # In-memory content has no file timestamps; only EXIF can date it.
+                if stat is not None:
+                    if self.created is None:
+                        self.created = datetime.fromtimestamp(stat.st_ctime)
+                    self.modified = datetime.fromtimestamp(stat.st_mtime)
 
             except (OSError, ValueError) as err:
                 print(f"Fehler beim Lesen von {self.filename}: {err}")
@@ -324,24 +452,59 @@ class AbstractImageDocument(AbstractDocument):
         return filepath.lower().endswith(('.jpg', '.jpeg', '.png'))
     
 
-def get_file_object(filepath: str) -> AbstractDocument:
+def _pdf_document(filepath: str, content: bytes | None = None) -> AbstractPDFDocument:
+    """
+    Returns a TechnicalDocumentation for technical documentation files and an
+    AbstractPDFDocument for all other PDFs.
+    """
+    if TechnicalDocumentation.is_technical_document(filepath):
+        return TechnicalDocumentation(filepath, content=content)
+    return AbstractPDFDocument(filepath, content=content)
+
+
+# Document factory by lower-case file extension; other files become an AbstractDocument.
+_FACTORY_BY_EXT = {
+    ".pdf": _pdf_document,
+    ".jpg": AbstractImageDocument,
+    ".jpeg": AbstractImageDocument,
+    ".png": AbstractImageDocument,
+}
+
+
+def get_file_object(filepath: str, content: bytes | None = None) -> AbstractDocument:
     """
     Returns an instance of the appropriate document class based on the file type.
 
     Args:
         filepath (str): The full path to the file.
+        content (bytes | None): The file content, if it is held in memory; the file
+            is then never read from disk.
 
     Returns:
         AbstractDocument: An instance of the appropriate document class.
     """
-    if TechnicalDocumentation.is_technical_document(filepath):
-        return TechnicalDocumentation(filepath)
-    elif AbstractPDFDocument.is_pdf(filepath):
-        return AbstractPDFDocument(filepath)
-    elif AbstractImageDocument.is_image(filepath):
-        return AbstractImageDocument(filepath)
-    else:
-        return AbstractDocument(filepath)
+    extension = os.path.splitext(filepath)[1].lower()
+    return _FACTORY_BY_EXT.get(extension, AbstractDocument)(filepath, content=content)
+
+
+def get_file_objects(filepaths: List[str]) -> List[AbstractDocument]:
+    """
+    Returns the document objects for several files, reading them concurrently.
+
+    Loading a document is dominated by file I/O (stat calls, PDF and image headers),
+    which releases the GIL, so threads overlap the latency of the individual files.
+
+    Args:
+        filepaths (List[str]): The full paths to the files.
+
+    Returns:
+        List[AbstractDocument]: The document objects in the order of the file paths.
+    """
+    if not filepaths:
+        return []
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(filepaths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get_file_object, filepaths))
 
 
 if __name__ == "__main__":
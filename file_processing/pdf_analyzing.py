@@ -1,18 +1,28 @@
 import json
 import re
 import base64
-from collections import defaultdict
-from typing import List, Dict, Any
+from dataclasses import dataclass, replace
+from typing import List, Dict, Any, Tuple, BinaryIO, Iterator
+import numpy as np
+import orjson
+import pypdfium2 as pdfium
 from pydantic import BaseModel
 from ai.prompting import prompt_with_image
 from lib.yacoub_asset import send_request
 
 PAGE_HEIGHT = 842  # Constant for page height
+# Numbered section headers such as "3.2.1 Installation"
+_SECTION_HDR_RE = re.compile(r"^(\d+(?:\.\d+)*)\s+(.+)")
+# From this many TOPLEFT cells on, table bounding boxes are flipped with one NumPy operation.
+BULK_FLIP_MIN_CELLS = 32
 
 
-class BBox(BaseModel):
+@dataclass(slots=True)
+class BBox:
     """
     Represents a bounding box with coordinates and coordinate origin.
+    A plain slotted dataclass instead of a pydantic model, since one is created per
+    document element and needs no validation.
 
     Attributes:
         t (float): Top coordinate.
@@ -44,11 +54,12 @@ class BBox(BaseModel):
             l=element.get("l", float("inf")),
             b=element.get("b", PAGE_HEIGHT),
             r=element.get("r", 0),
-            coord_original=element.get("coord_origin", "BOTTOMLEFT"),
+            coord_origin=element.get("coord_origin", "BOTTOMLEFT"),
         )
 
 
-class Prov(BaseModel):
+@dataclass(slots=True)
+class Prov:
     """
     Metadata about an element, including its bounding box and page number.
 
@@ -107,11 +118,30 @@ class BoundingBoxUtils:
         """
         Utility class for processing bounding boxes, such as coordinate conversion and merging.
         """
-        updated_bbox = bbox.model_copy()
-        updated_bbox.b = PAGE_HEIGHT - updated_bbox.b
-        updated_bbox.t = PAGE_HEIGHT - updated_bbox.t
-        updated_bbox.coord_original = "BOTTOMLEFT"
-        return updated_bbox
+        return replace(
+            bbox,
+            b=PAGE_HEIGHT - bbox.b,
+            t=PAGE_HEIGHT - bbox.t,
+            coord_origin="BOTTOMLEFT",
+        )
+
+    @staticmethod
+    def recalculate_bboxes_topleft2bottomleft(bboxes: List[BBox]) -> List[BBox]:
+        """
+        Converts many bounding boxes from TOPLEFT to BOTTOMLEFT coordinates with
+        a single vectorized subtraction instead of one conversion per box.
+
+        Args:
+            bboxes (List[BBox]): The bounding boxes in TOPLEFT coordinates.
+
+        Returns:
+            List[BBox]: The converted bounding boxes, in input order.
+        """
+        flipped = PAGE_HEIGHT - np.array([(bbox.t, bbox.b) for bbox in bboxes], dtype=np.float64)
+        return [
+            replace(bbox, t=t, b=b, coord_origin="BOTTOMLEFT")
+            for bbox, (t, b) in zip(bboxes, flipped.tolist())
+        ]
 
     @staticmethod
     def update_bbox(current_bbox: BBox, new_bbox: BBox):
@@ -145,11 +175,14 @@ class ImageDecoderFactory:
         Returns:
             bytes: The decoded image content as bytes.
         """
-        if "," in image_uri:
-            image_uri = image_uri.split(",")[1]
-        image_uri = image_uri.strip()
-        image_uri += "=" * (-len(image_uri) % 4)  # Padding correction
-        return base64.b64decode(image_uri)
+        # Work on bytes, so b64decode does not convert the string again.
+        data = image_uri.encode("ascii", "ignore")
+        comma = data.find(b",")
+        if comma >= 0:
+            data = data[comma + 1:]
+        data = data.strip()
+        data += b"=" * (-len(data) & 3)  # Padding correction
+        return base64.b64decode(data, validate=False)
 
 
 # Section Processor
@@ -159,7 +192,7 @@ class SectionProcessor:
     """
 
     @staticmethod
-    def split_elements_by_section(elements: Dict[str, Any]) -> Dict[str, SectionData]:
+    def split_elements_by_section(elements: Dict[str, Any]) -> Dict[Tuple[int, int, int], SectionData]:
         """
         Splits elements into sections based on labels and structure.
 
@@ -167,100 +200,143 @@ class SectionProcessor:
             elements (Dict[str, Any]): The raw elements extracted from the document.
 
         Returns:
-            Dict[str, SectionData]: A dictionary mapping section keys to SectionData objects.
+            Dict[Tuple[int, int, int], SectionData]: A dictionary mapping section keys
+                (see build_key) to SectionData objects.
         """
-        sections = defaultdict(
-            lambda: SectionData(
-                chapter="",
-                section="",
-                page_header="",
-                texts=[],
-                prov=Prov(
-                    bbox=BBox(t=float("inf"), l=float("inf"), b=PAGE_HEIGHT, r=0)
-                ),
-            )
-        )
+        return dict(SectionProcessor.iter_sections(elements))
+
+    @staticmethod
+    def iter_sections(elements: Dict[str, Any]) -> Iterator[Tuple[Tuple[int, int, int], SectionData]]:
+        """
+        Splits elements into sections like split_elements_by_section, but yields each
+        section as soon as the next section header closes it.
+
+        Content is only ever added to the current section, so a section is complete
+        once the current key moves on and is dropped after it was yielded.
+
+        Args:
+            elements (Dict[str, Any]): The raw elements extracted from the document.
+
+        Yields:
+            Tuple[Tuple[int, int, int], SectionData]: The section key (see build_key)
+                and the section, for sections that contain texts.
+        """
+        sections = {}
 
         current_key = None
         current_chapter = ""
         current_page_header = ""
         used_images = set()
+        # Reversed, so that the first picture wins if a reference occurs twice.
+        pictures_by_ref = {
+            picture.get("self_ref"): picture for picture in reversed(elements.get("pictures", []))
+        }
 
         for element in elements.get("content", []):
             prov = Prov.from_element_dictionary(element.get("prov", {}))
             bbox = prov.bbox
             text = element.get("text", "")
+            parent_ref = (element.get("parent") or {}).get("$ref", "")
 
             if element.get("label") == "section_header":
-                match = re.match(r"^(\d+(?:\.\d+)*)(?:\s+)(.+)", text)
+                match = _SECTION_HDR_RE.match(text)
                 if match:
                     hierarchy = match.group(1)
                     hierarchy_level = hierarchy.count(".")
 
+                    yield from SectionProcessor._close_section(sections, current_key)
                     current_key = SectionProcessor.build_key(prov)
 
                     current_chapter = SectionProcessor.set_chapter(
                         current_chapter, hierarchy_level, text
                     )
-                    sections[current_key].chapter = current_chapter
+                    SectionProcessor.get_section(sections, current_key).chapter = current_chapter
                     continue
 
+                yield from SectionProcessor._close_section(sections, current_key)
                 current_key = SectionProcessor.build_key(prov)
 
-                sections[current_key].chapter = current_chapter
-                sections[current_key].section = text
-                sections[current_key].page_header = current_page_header
-                sections[current_key].prov.page_number = prov.page_number
-                sections[current_key].prov.bbox.t = bbox.t
-                sections[current_key].prov.bbox.l = bbox.l
+                section = SectionProcessor.get_section(sections, current_key)
+                section.chapter = current_chapter
+                section.section = text
+                section.page_header = current_page_header
+                section.prov.page_number = prov.page_number
+                section.prov.bbox.t = bbox.t
+                section.prov.bbox.l = bbox.l
 
             elif element.get("label") == "page_header":
                 current_page_header = text
 
             elif element.get("label") == "table":
                 table_elements = SectionProcessor.get_table_content(element)
-                sections[current_key].texts.extend(table_elements)
-                BoundingBoxUtils.update_bbox(sections[current_key].prov.bbox, bbox)
-
-            elif (
-                "pictures" in element.get("parent", {}).get("$ref", "")
-                and element.get("parent").get("$ref") not in used_images
-            ):
-                used_images.add(element.get("parent").get("$ref"))
-                matching_picture = next(
-                    (
-                        pic
-                        for pic in elements.get("pictures", [])
-                        if pic.get("self_ref") == element.get("parent").get("$ref")
-                    ),
-                    None,
-                )
+                section = SectionProcessor.get_section(sections, current_key)
+                section.texts.extend(table_elements)
+                BoundingBoxUtils.update_bbox(section.prov.bbox, bbox)
+
+            elif "pictures" in parent_ref and parent_ref not in used_images:
+                used_images.add(parent_ref)
+                matching_picture = pictures_by_ref.get(parent_ref)
                 if matching_picture:
+                    section = SectionProcessor.get_section(sections, current_key)
                     image_uri = matching_picture.get("image", {}).get("uri", "")
                     decoded_image_uri = ImageDecoderFactory.decode_base64_image(
                         image_uri
                     )
                     image_description = prompt_with_image(
                         decoded_image_uri,
-                        f"""Was ist auf dem Bild zur Überschrift {sections[current_key].chapter},
-                        {sections[current_key].section} zu sehen?
+                        f"""Was ist auf dem Bild zur Überschrift {section.chapter},
+                        {section.section} zu sehen?
                         Beschreibe fachlich und prägnant für ein anderes KI-Modell.""",
                     )
-                    sections[current_key].texts.append(image_description)
+                    section.texts.append(image_description)
 
             elif current_key:
-                sections[current_key].texts.append(text)
-                BoundingBoxUtils.update_bbox(sections[current_key].prov.bbox, bbox)
+                section = SectionProcessor.get_section(sections, current_key)
+                section.texts.append(text)
+                BoundingBoxUtils.update_bbox(section.prov.bbox, bbox)
 
         # Bereinigen von Einträgen ohne Texte
-        for key in list(sections.keys()):
-            if not sections[key].texts:
-                del sections[key]
+        for key, section in sections.items():
+            if section.texts:
+                yield key, section
 
-        return sections
+    @staticmethod
+    def _close_section(sections: Dict[Tuple[int, int, int], SectionData], key):
+        """
+        Removes the section stored under the key and yields it if it contains texts.
+        """
+        section = sections.pop(key, None)
+        if section is not None and section.texts:
+            yield key, section
+
+    @staticmethod
+    def get_section(sections: Dict[Tuple[int, int, int], SectionData], key) -> SectionData:
+        """
+        Returns the section stored under the key, creating an empty one on first use.
+        The empty section is built with model_construct, as its defaults need no validation.
+
+        Args:
+            sections (Dict[Tuple[int, int, int], SectionData]): The sections collected so far.
+            key (Tuple[int, int, int]): The section key, see build_key.
+
+        Returns:
+            SectionData: The section for the key.
+        """
+        section = sections.get(key)
+        if section is None:
+            section = sections[key] = SectionData.model_construct(
+                chapter="",
+                section="",
+                page_header="",
+                texts=[],
+                prov=Prov(
+                    bbox=BBox(t=float("inf"), l=float("inf"), b=PAGE_HEIGHT, r=0)
+                ),
+            )
+        return section
 
     @staticmethod
-    def build_key(prov: Prov):
+    def build_key(prov: Prov) -> Tuple[int, int, int]:
         """
         Builds a unique key based on bounding box and page number.
 
@@ -268,9 +344,10 @@ class SectionProcessor:
             prov (Prov): Metadata for the element.
 
         Returns:
-            str: A unique key representing the element's position.
+            Tuple[int, int, int]: (top, left, page number), a key representing the
+                element's position that hashes faster than a formatted string.
         """
-        return f"{int(prov.bbox.t)}_{int(prov.bbox.l)}_p{prov.page_number}"
+        return (int(prov.bbox.t), int(prov.bbox.l), prov.page_number)
 
     @staticmethod
     def get_table_content(table: Dict[str, Any], only_text: bool = True) -> List[Any]:
@@ -284,18 +361,25 @@ class SectionProcessor:
         Returns:
             List[Any]: A list of table contents, as text or objects.
         """
-        table_elements = []
-        for element in table.get("data", {}).get("table_cells", []):
-            bbox = BBox.from_element_dictionary(element.get("bbox").copy())
-            if bbox.coord_origin == "TOPLEFT":
-                bbox = BoundingBoxUtils.recalculate_bbox_topleft2bottomleft(bbox)
+        cells = table.get("data", {}).get("table_cells", [])
+        if only_text:
+            # The bounding boxes are only needed for the full cell data.
+            return [cell.get("text") for cell in cells]
+
+        bboxes = [BBox.from_element_dictionary(cell.get("bbox")) for cell in cells]
+        topleft = [index for index, bbox in enumerate(bboxes) if bbox.coord_origin == "TOPLEFT"]
+        if len(topleft) >= BULK_FLIP_MIN_CELLS:
+            flipped = BoundingBoxUtils.recalculate_bboxes_topleft2bottomleft([bboxes[i] for i in topleft])
+            for index, bbox in zip(topleft, flipped):
+                bboxes[index] = bbox
+        else:
+            for index in topleft:
+                bboxes[index] = BoundingBoxUtils.recalculate_bbox_topleft2bottomleft(bboxes[index])
 
-            text = element.get("text")
-            if only_text:
-                table_elements.append(text)
-            else:
-                table_elements.append({"text": text, "prov": [{"bbox": bbox}]})
-        return table_elements
+        return [
+            {"text": cell.get("text"), "prov": [{"bbox": bbox}]}
+            for cell, bbox in zip(cells, bboxes)
+        ]
 
     @staticmethod
     def set_chapter(current_chapter, hierarchy_level, text):
@@ -348,17 +432,43 @@ class PDFContentGetter:
         Returns:
             List[str]: List of lines or elements in the document.
         """
-        with open(json_filepath, "r", encoding="utf-8") as json_file:
-            parsed_json = json.load(json_file)
+        with open(json_filepath, "rb") as json_file:
+            parsed_json = orjson.loads(json_file.read())
         return parsed_json
 
     @staticmethod
-    def get_content_from_docling_server(file_path: str) -> List[str]:
+    def get_text_layer(source: str | bytes) -> List[Tuple[str, float, float]]:
+        """
+        Reads the embedded text layer of a PDF with PDFium; no OCR, layout or table analysis.
+
+        Args:
+            source (str | bytes): Path to the PDF file, or its content.
+
+        Returns:
+            List[Tuple[str, float, float]]: (text, width, height) for every page.
+        """
+        pages = []
+        pdf = pdfium.PdfDocument(source)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                width, height = page.get_size()
+                # PDFium separates lines with CRLF.
+                pages.append((textpage.get_text_bounded().replace("\r\n", "\n"), width, height))
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+        return pages
+
+    @staticmethod
+    def get_content_from_docling_server(file_path: str | tuple) -> List[str]:
         """
         Sends a file to the Docling server and retrieves the parsed content.
 
         Args:
-            file_path (str): Path to the file to send.
+            file_path (str | tuple): Path to the file to send, or a (filename, stream)
+                tuple for a document that is held in memory.
 
         Returns:
             List[str]: List of lines or elements returned by the server.
@@ -371,7 +481,8 @@ class PDFContentGetter:
                 f"""Failed to retrieve content from Docling server.
                 Status code: {res.status_code}, Response: {res.text}"""
             )
-        returning_json = json.loads(res.text)
+        # Parse the raw UTF-8 bytes; res.text would decode a full copy of the body first.
+        returning_json = orjson.loads(res.content)
         return returning_json
 
 
@@ -400,6 +511,60 @@ class PDFIngestApplication:
         sections = SectionProcessor.split_elements_by_section(parsed_json)
         return sections
 
+    @staticmethod
+    def run_iter(input_file: str | Tuple[str, BinaryIO]) -> Iterator[SectionData]:
+        """
+        Runs the processing on the given PDF and yields the sections one by one.
+
+        Args:
+            input_file (str | Tuple[str, BinaryIO]): Path to the input PDF file, or a
+                (filename, stream) tuple for a document that is held in memory.
+        """
+        parsed_json = PDFContentGetter.get_content_from_docling_server(input_file)
+        for _, section in SectionProcessor.iter_sections(parsed_json):
+            yield section
+
+    @staticmethod
+    def run_fast(source: str | bytes) -> List[SectionData]:
+        """
+        Splits a PDF into one section per page from its text layer only.
+        Much faster than the Docling conversion, but without OCR, headings, tables
+        or image descriptions, so it only suits PDFs that carry a text layer.
+
+        Args:
+            source (str | bytes): Path to the PDF file, or its content.
+
+        Returns:
+            List[SectionData]: The sections of the pages that contain text.
+        """
+        return [
+            SectionData.model_construct(
+                chapter="",
+                section=f"Page {page_number}",
+                page_header="",
+                texts=[text.strip()],
+                prov=Prov(
+                    bbox=BBox(t=height, l=0, b=0, r=width), page_number=page_number
+                ),
+            )
+            for page_number, (text, width, height)
+            in enumerate(PDFContentGetter.get_text_layer(source), start=1)
+            if text.strip()
+        ]
+
+    @staticmethod
+    def run_stream(stream: BinaryIO, filename: str = "document.pdf"):
+        """
+        Runs the processing on a PDF document that is held in memory.
+
+        Args:
+            stream (BinaryIO): The PDF content, e.g. a BytesIO.
+            filename (str): The file name reported to the Docling server.
+        """
+        parsed_json = PDFContentGetter.get_content_from_docling_server((filename, stream))
+        sections = SectionProcessor.split_elements_by_section(parsed_json)
+        return sections
+
 
 if __name__ == "__main__":
     # output_path = cutout("pdf_processing/documents/54530_hdb_de_12.pdf", 39, 39)
@@ -1,6 +1,12 @@
 
 import os
-from typing import List
+import hashlib
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from io import BytesIO
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
 from abc import ABC, abstractmethod#
 import json
 from lib.project_path import ProjectPath
@@ -8,9 +14,61 @@ from model.jira_models import JiraAttachement, JiraBaseIssue
 from ai.prompting import prompt_with_image
 from ai.prompt_store import PromptStore
 from file_processing.pdf_analyzing import PDFIngestApplication
-from file_processing.document_types import get_file_object, AbstractDocument, AbstractImageDocument
+from file_processing.document_types import AbstractDocument, AbstractImageDocument
+from jira_tools.extraction_cache import ExtractionCache
 from lib.logger import logger
 
+# Attachments of one issue processed concurrently (download, extraction and LLM calls are I/O-bound).
+ATTACHMENT_WORKERS = 8
+# PDFs whose text layer holds fewer characters are converted (with OCR) by the Docling server.
+FAST_PATH_MIN_CHARS = 200
+# Attachments above this size are neither looked up in nor written to the extraction cache.
+MAX_CACHED_ATTACHMENT_SIZE = 50 * 1024 * 1024
+
+# Image descriptions by (content SHA-256, prompt) for the lifetime of the process.
+_descriptions: Dict[Tuple[str, str], Future] = {}
+_descriptions_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _describe_image_prompt() -> str:
+    """
+    Returns the prompt for describing an image attachment; it is constant, so it is built once.
+    """
+    return PromptStore.get_prompt('describe', object='image', recipient='ai_model', format='contextual_search')
+
+
+def describe_image(content: bytes, prompt: str) -> str:
+    """
+    Describes an image with the model, calling it once per distinct image and prompt.
+
+    Repeated images (e.g. a logo attached to many issues) reuse the first description;
+    a concurrent request for the same image waits for the call already in flight.
+
+    Args:
+        content (bytes): The image content.
+        prompt (str): The prompt for the model.
+    Returns:
+        str: The description of the image.
+    """
+    key = (hashlib.sha256(content).hexdigest(), prompt)
+    with _descriptions_lock:
+        future = _descriptions.get(key)
+        owner = future is None
+        if owner:
+            future = _descriptions[key] = Future()
+
+    if owner:
+        try:
+            future.set_result(prompt_with_image(content, prompt))
+        except Exception as e:
+            # Do not keep the failure; the next request for the image tries again.
+            with _descriptions_lock:
+                del _descriptions[key]
+            future.set_exception(e)
+    return future.result()
+
+
 class AttachmentExtractor(ABC):
     """
     Interface for attachment extractors.
@@ -26,11 +84,9 @@ class AttachmentExtractor(ABC):
         self.doc = doc
 
     @abstractmethod
-    def extract(self, base_path=None) -> str:
+    def extract(self) -> str:
         """
-        Extract content from the given file.
-        Args;
-            base_path (str): The base path for the file.
+        Extract content from the given document (in memory or on disk, see AbstractDocument.read).
         Returns:
             str: The extracted content.
         """
@@ -60,30 +116,42 @@ class AttachementHandler:
         if not os.path.exists(absolute_path):
             os.makedirs(absolute_path)
 
+        cache_dir = ProjectPath.absolute(ProjectPath.local('[]/tmp/extract_cache'))
+        os.makedirs(cache_dir, exist_ok=True)
+        self.extraction_cache = ExtractionCache(os.path.join(cache_dir, 'extractions'))
+
     def get_attachment_content(self, attachement:JiraAttachement):
         """
-        Get the content of a Jira attachment.
+        Get the content of a Jira attachment and record its SHA-256 on the attachment.
         Args:
             attacgenent (JiraAttachement): The Jira attachment object.
         Returns:
             bytes: The content of the attachment.
         """
-        return attachement.get_content(self.jira_client)
+        content = attachement.get_content(self.jira_client)
+        attachement.sha256 = hashlib.sha256(content).hexdigest()
+        return content
 
-    def save_attachment_local(self, attachement:JiraAttachement, filename=None):
+    def save_attachment_local(self, attachement:JiraAttachement, filename=None, content=None):
         """
         Save the attachment content to a file.
         Args:
             attachement (JiraAttachement): The Jira attachment object.
+            filename (str): The file name to save under (defaults to the attachment's).
+            content (bytes): The already downloaded content; if omitted, the download is
+                streamed to the file chunk by chunk without holding it in memory.
         Returns:
             str: The path to the saved file.
         """
-        content = self.get_attachment_content(attachement)
         new_filename = filename if filename else attachement.filename
         filename = f"{self.base_path}/{new_filename}"
 
         with open(filename, "wb") as f:
-            f.write(content)
+            if content is not None:
+                f.write(content)
+            else:
+                for chunk in attachement.stream_content(self.jira_client):
+                    f.write(chunk)
 
         return filename
 
@@ -93,14 +161,13 @@ class AttachementHandler:
         Args:
             attachement (JiraAttachement): The Jira attachment object.
             prompt (str): The prompt to describe the attachment.
-            If None, a default prompt will be used.
+            If None, the prompt of the ImageExtractor is used, so the description is
+            shared with the attachment's extraction.
         Returns:
             str: The description of the attachment.
         """
         content = self.get_attachment_content(attachement)
-        prompt = prompt or "Beschreibe das Bild in einem KI-Model optimierten Format."
-        response = prompt_with_image(content, prompt)
-        return response
+        return describe_image(content, prompt or _describe_image_prompt())
 
     def process_attachements(self, jira_issue: List[JiraBaseIssue], save_file=False) -> List[str]:
         """
@@ -111,28 +178,63 @@ class AttachementHandler:
         Returns:
             List[str]: A list of descriptions for each attachment.
         """
-        res_object = {}
-        for attachement in jira_issue.attachments:
-            fn = attachement.filename
-            # description = self.describe_attachement(attachement, prompt)
-            # descriptions.append(description)
-            if save_file:
-                _filename = f"{jira_issue.key}_{attachement.filename}"
-                filename = self.save_attachment_local(attachement, filename=_filename)
-                logger.info(f"Attachment saved to {filename}")
-
-            document = get_file_object(fn if not save_file else filename)
-            extension = document.get_file_extension()
-            if extension not in handlers:
-                logger.warning(f"No handler found for file type: {extension}. Skipping attachment.")
-                continue
-            hdlr = handlers.get(extension, None)(document)
-            res_object[attachement.filename] = {
-                'meta_data': hdlr.get_meta_data(),
-                'content': hdlr.extract(base_path=self.base_path),
-            }
-
-        return res_object
+        attachements = jira_issue.attachments
+        if not attachements:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(ATTACHMENT_WORKERS, len(attachements))) as executor:
+            results = executor.map(
+                lambda attachement: self._process_attachement(jira_issue, attachement, save_file),
+                attachements,
+            )
+            return {filename: result for filename, result in results if result is not None}
+
+    def _process_attachement(self, jira_issue: JiraBaseIssue, attachement: JiraAttachement, save_file=False):
+        """
+        Downloads a single attachment and extracts it from memory.
+        Args:
+            jira_issue (JiraBaseIssue): The Jira issue the attachment belongs to.
+            attachement (JiraAttachement): The attachment to process.
+            save_file (bool): Whether to additionally save the attachment locally.
+        Returns:
+            tuple: (attachment filename, dict with meta data and content), or
+                (attachment filename, None) if no handler exists for the file type.
+        """
+        fn = attachement.filename
+        # The extension comes from the attachment's name, so unsupported files are
+        # skipped before they are downloaded.
+        hdlr_cls = handlers.get(attachement.extension)
+        if hdlr_cls is None:
+            logger.warning("No handler found for file type: %s. Skipping attachment.", attachement.extension)
+            if not save_file:
+                return fn, None
+
+        content = self.get_attachment_content(attachement)
+        if save_file:
+            _filename = f"{jira_issue.key}_{attachement.filename}"
+            filename = self.save_attachment_local(attachement, filename=_filename, content=content)
+            logger.info("Attachment saved to %s", filename)
+        if hdlr_cls is None:
+            return fn, None
+
+        # The meta data is derived from the attachment's name, which can differ between
+        # attachments with the same bytes, so only the extracted content is cached.
+        hdlr = hdlr_cls(AbstractDocument.from_bytes(fn, content))
+        meta_data = hdlr.get_meta_data()
+
+        extractor = hdlr_cls.__name__
+        cacheable = attachement.size <= MAX_CACHED_ATTACHMENT_SIZE
+        extracted = self.extraction_cache.get(attachement.sha256, extractor) if cacheable else None
+        if extracted is not None:
+            logger.info("Using cached extraction of %s", fn)
+        else:
+            extracted = hdlr.extract()
+            if cacheable:
+                self.extraction_cache.put(attachement.sha256, extractor, extracted)
+        result = {
+            'meta_data': meta_data,
+            'content': extracted,
+        }
+        return fn, result
 
 
 # handlers
@@ -142,40 +244,39 @@ class PDFExtractor(AttachmentExtractor):
     Extractor for PDF files.
     """
 
-    def extract(self, base_path=None) -> str:
-        fn = f"{base_path if base_path else ''}/{self.doc.filename}"
-        content = PDFIngestApplication.run(fn)
-        elements = []
-        for chunk in content:
-            cnt = content[chunk]
-            elements.append(f"{cnt.chapter}{'\n' if cnt.chapter else ''}{cnt.section}\n{' '.join(cnt.texts)}")
-        return elements
+    def extract(self) -> str:
+        content = self.doc.read()
+        sections = PDFIngestApplication.run_fast(content)
+        if sum(len(text) for section in sections for text in section.texts) >= FAST_PATH_MIN_CHARS:
+            logger.info("Extracted %s from its text layer", self.doc.filename)
+        else:
+            logger.info("No text layer in %s, converting it with Docling (OCR)", self.doc.filename)
+            sections = PDFIngestApplication.run_iter((self.doc.filename, BytesIO(content)))
+        return [
+            f"{cnt.chapter}{'\n' if cnt.chapter else ''}{cnt.section}\n{' '.join(cnt.texts)}"
+            for cnt in sections
+        ]
 
     def get_meta_data(self) -> dict:
-        # Implement PDF metadata extraction logic here
-        return self.doc.get_path_attributes().model_dump_json()
+        # A JSON-compatible dict; callers serialize the whole result once.
+        return self.doc.get_path_attributes().model_dump(mode="json")
 
 
 class ImageExtractor(AttachmentExtractor):
     """
     Extractor for image files.
     """
-    def extract(self, base_path=None) -> str:
-        fn = f"{base_path + '/' if base_path else ''}{self.doc.filename}"
-        with open(fn, "rb") as f:
-            content = f.read()
-        prompt = PromptStore.get_prompt('describe', object='image', recipient='ai_model', format='contextual_search')
-        res = prompt_with_image(content, prompt)
-        return res
+    def extract(self) -> str:
+        return describe_image(self.doc.read(), _describe_image_prompt())
 
     def get_meta_data(self) -> dict:
-        # Implement image metadata extraction logic here
-        self.doc.get_path_attributes().model_dump_json()
+        # A JSON-compatible dict; callers serialize the whole result once.
+        return self.doc.get_path_attributes().model_dump(mode="json")
 
-handlers = {
+handlers = MappingProxyType({
     "pdf": PDFExtractor,
     "jpg": ImageExtractor,
     "jpeg": ImageExtractor,
     "png": ImageExtractor,
     # Add more handlers as needed
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+extraction_cache.py
+
+This module provides the ExtractionCache class, which keeps the extracted content
+of attachments so that re-syncing an issue does not run the PDF ingestion or the
+image description again for attachments whose content did not change.
+
+Entries are keyed by the SHA-256 of the attachment content and the extractor name
+and stored in a shelve file, so they persist across runs. Only the content is
+stored: meta data derived from the attachment's name must not be shared between
+attachments with the same bytes.
+"""
+
+import pickle
+import shelve
+import threading
+
+from lib.logger import logger
+
+
+class ExtractionCache:
+    """
+    A persistent, content-addressed cache for extracted attachment content.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The shelve file (without suffix) holding the entries.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        # shelve does not support concurrent access; attachments are processed by a thread pool.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(content_hash: str, extractor: str) -> str:
+        # "content" marks entries holding only the extracted content; entries of the
+        # former layout (content and meta data) are never read.
+        return f"{content_hash}:{extractor}:content"
+
+    def get(self, content_hash: str, extractor: str):
+        """
+        Returns the cached extracted content for the content hash and extractor, or None on a miss.
+        """
+        key = self._key(content_hash, extractor)
+        with self._lock:
+            with shelve.open(self.path) as db:
+                result = db.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def put(self, content_hash: str, extractor: str, result):
+        """
+        Stores the extracted content for the content hash and extractor.
+        """
+        key = self._key(content_hash, extractor)
+        with self._lock:
+            try:
+                with shelve.open(self.path) as db:
+                    db[key] = result
+            except (OSError, TypeError, pickle.PicklingError) as e:
+                logger.warning("Could not cache the extraction result %s: %s", key, e)
@@ -5,10 +5,10 @@ tables related to Jira issues and subtasks.
 It also includes logging to track the success or failure of these operations.
 """
 
-from typing import Optional, List, Union
+import sys
+from typing import Optional, Union, Tuple, Dict
 from model.jira_models import (
     JiraUser,
-    JiraWorklog,
     JiraSubtask,
     JiraStory,
     JiraTask,
@@ -19,18 +19,25 @@ from model.jira_models import (
     Author
 )
 from lib.logger import logger
-from jira.resources import Issue 
+
+# Issue class by issue type name; subtasks are recognized by the issuetype's subtask flag.
+ISSUE_CLASSES = {
+    "Epic": JiraEpic,
+    "Story": JiraStory,
+    "Innovation": JiraStory,
+    "Task": JiraTask,
+    "Bug": JiraBug,
+}
 
 class JiraFactory:
     """
     A factory class for creating and parsing Jira-related objects.
-    This class provides static methods to parse Jira user data, worklogs,
-    and create Jira issue objects such as subtasks and stories.
+    This class provides static methods to parse Jira user data and create
+    Jira issue objects such as subtasks and stories.
     """
-    @staticmethod
-    def get_field(issue_fields, field_name, is_dict, default=None):
-        value = issue_fields.get(field_name, default) if is_dict else getattr(issue_fields, field_name, default) if hasattr(issue_fields, field_name) else default
-        return value if value not in (None, "") else default
+    # Users parsed during the current run by accountId; the same assignees and reporters
+    # recur on many issues. Cleared by reset_user_cache.
+    _user_cache: Dict[str, JiraUser] = {}
 
     @staticmethod
     def parse_user(user) -> Optional[JiraUser]:
@@ -44,40 +51,23 @@ class JiraFactory:
         Raises:
             ValueError: If the user object is invalid or missing required attributes.
         """
-        if user:
-            is_dict = isinstance(user, dict)
-            return JiraUser(
-                displayName=JiraFactory.get_field(user, "displayName", is_dict=is_dict),
-                emailAddress=JiraFactory.get_field(user, "emailAddress", default="No person assigned.", is_dict=is_dict),
-            )
-        return None
+        if not user:
+            return None
+        account_id = user.get("accountId") if isinstance(user, dict) else getattr(user, "accountId", None)
+        if account_id is None:
+            return JiraUser.model_validate(user)
+        parsed = JiraFactory._user_cache.get(account_id)
+        if parsed is None:
+            parsed = JiraFactory._user_cache[account_id] = JiraUser.model_validate(user)
+        return parsed
 
     @staticmethod
-    def parse_worklogs(worklog_obj) -> List[JiraWorklog]:
+    def reset_user_cache() -> None:
         """
-        Parse a Jira worklog object into a list of JiraWorklog instances.
-        Args:
-            worklog_obj: The Jira worklog object to parse.
-        Returns:
-            List[JiraWorklog]: A list of JiraWorklog instances if the worklog
-            object contains worklogs, otherwise an empty list.
-
-        Raises:
-            ValueError: If the worklog object is invalid or missing required attributes.
+        Forgets the users parsed so far, bounding the cache to one run.
         """
-        return (
-            [
-                JiraWorklog(
-                    started=w.started,
-                    timeSpent=w.timeSpent,
-                    timeSpentSeconds=w.timeSpentSeconds,
-                )
-                for w in worklog_obj.worklogs
-            ]
-            if hasattr(worklog_obj, "worklogs")
-            else []
-        )
-    
+        JiraFactory._user_cache.clear()
+
     @staticmethod
     def parse_author(author_obj) -> Optional[JiraUser]:
         """
@@ -90,20 +80,62 @@ class JiraFactory:
         Raises:
             ValueError: If the author object is invalid or missing required attributes.
         """
-        if author_obj:
-            is_dict = isinstance(author_obj, dict)
-            return Author(
-                accountId=JiraFactory.get_field(author_obj, "accountId", is_dict=is_dict),
-                displayName=JiraFactory.get_field(author_obj, "displayName", is_dict=is_dict),
-            )
-        return None
+        return Author.model_validate(author_obj) if author_obj else None
+
+    @staticmethod
+    def _normalize(issue) -> Tuple[str, str, dict]:
+        """
+        Returns the key, the URL and the fields of an issue.
+        Args:
+            issue: The raw JSON dict of an issue, as returned by /search.
+        Returns:
+            Tuple[str, str, dict]: The issue key, its URL and its fields dict.
+        """
+        return issue["key"], issue["self"], issue["fields"]
+
+    @staticmethod
+    def _base_kwargs(key: str, url: str, fields: dict) -> dict:
+        """
+        Builds the JiraBaseIssue keyword arguments from the raw fields of an issue.
+        Straight-line dict lookups; `or` falls back to the defaults, since Jira sends
+        missing values as null or "".
+        Args:
+            key (str): The issue key.
+            url (str): The issue URL.
+            fields (dict): The raw fields of the issue.
+        Returns:
+            dict: The keyword arguments shared by all issue classes.
+        """
+        get = fields.get
+        status = get("status")
+        attachments = get("attachment") or []
+        return {
+            "key": key,
+            "summary": get("summary") or None,
+            "description": get("description") or "No description",
+            # Few distinct values repeat across all issues; interning shares one string each.
+            "status": sys.intern(status["name"]),
+            "statusCategory": sys.intern(status["statusCategory"]["name"]),
+            "project": sys.intern(get("project")["name"]),
+            "issue_type": sys.intern(get("issuetype")["name"]),
+            "assignee": JiraFactory.parse_user(get("assignee")),
+            "reporter": JiraFactory.parse_user(get("reporter")),
+            "subtasks": [task["key"] for task in get("subtasks") or []],
+            "created": get("created") or None,
+            "updated": get("updated") or None,
+            "timeSpentSeconds": get("timespent") or 0,
+            "url": url,
+            "attachments": [JiraAttachement.model_validate(att) for att in attachments]
+            if isinstance(attachments, list)
+            else [],
+        }
 
     @staticmethod
     def create_issue(issue) -> Union[JiraSubtask, JiraStory]:
         """
         Create a Jira issue object (subtask or story) from a Jira issue.
         Args:
-            issue: The Jira issue object to create from.
+            issue: The raw JSON dict of the Jira issue (see fetch_issues).
         Returns:
             Union[JiraSubtask, JiraStory]: A JiraSubtask instance if the issue
             is a subtask, otherwise a JiraStory instance.
@@ -111,112 +143,22 @@ class JiraFactory:
         Raises:
 
         """
+        key, url, fields = JiraFactory._normalize(issue)
+        base_kwargs = JiraFactory._base_kwargs(key, url, fields)
 
-        def parse_fields(issue_fields, is_dict=False):
-
-            return {
-            "key": issue['key'] if is_dict else issue.key,
-            "summary": JiraFactory.get_field(
-                issue_fields, "summary", is_dict
-            ),
-            "description": JiraFactory.get_field(
-                issue_fields, "description", is_dict, "No description"
-            ),
-            "status": (
-                JiraFactory.get_field(issue_fields, "status", is_dict)["name"]
-                if is_dict
-                else JiraFactory.get_field(issue_fields, "status", is_dict).name
-            ),
-            "statusCategory": (
-                JiraFactory.get_field(issue_fields, "status", is_dict)["statusCategory"]["name"]
-                if is_dict
-                else JiraFactory.get_field(issue_fields, "status", is_dict).statusCategory.name
-            ),
-            "project": (
-                JiraFactory.get_field(issue_fields, "project", is_dict)["name"]
-                if is_dict
-                else JiraFactory.get_field(issue_fields, "project", is_dict).name
-            ),
-            "issue_type": (
-                JiraFactory.get_field(issue_fields, "issuetype", is_dict)["name"]
-                if is_dict
-                else JiraFactory.get_field(issue_fields, "issuetype", is_dict).name
-            ),
-            "assignee": JiraFactory.parse_user(
-                JiraFactory.get_field(issue_fields, "assignee", is_dict)
-            ),
-            "reporter": JiraFactory.parse_user(
-                JiraFactory.get_field(issue_fields, "reporter", is_dict)
-            ),
-            "subtasks": [task.key for task in JiraFactory.get_field(issue_fields, "subtasks", is_dict, [])],
-            "created": JiraFactory.get_field(issue_fields, "created", is_dict),
-            "updated": JiraFactory.get_field(issue_fields, "updated", is_dict),
-            "timeSpentSeconds": JiraFactory.get_field(
-                issue_fields, "timespent", is_dict, 0
-            ),
-            "url": issue["self"] if is_dict else issue.self,
-            "worklogs": JiraFactory.parse_worklogs(
-                JiraFactory.get_field(issue_fields, "worklog", is_dict, {})
-            ),
-            "attachments": [
-                JiraAttachement(
-                    id=att["id"] if is_dict else att.id,
-                    filename=att["filename"] if is_dict else att.filename,
-                    author=JiraFactory.parse_author(
-                        att.get("author") if is_dict else att.author
-                    ),
-                    created=att["created"] if is_dict else att.created,
-                    size=att["size"] if is_dict else att.size,
-                    mimeType=att["mimeType"] if is_dict else att.mimeType,
-                    content=att["content"] if is_dict else att.content,
-                )
-                for att in JiraFactory.get_field(issue_fields, "attachment", is_dict, [])
-                if isinstance(
-                    JiraFactory.get_field(issue_fields, "attachment", is_dict, []), list
-                )
-            ]
-            if JiraFactory.get_field(issue_fields, "attachment", is_dict)
-            else [],
-            }
-
-        if isinstance(issue, Issue):
-            fields = issue.fields
-            base_kwargs = parse_fields(fields)
-        else:
-            fields = issue['fields']
-            base_kwargs = parse_fields(fields, is_dict=True)
-
-        if '981' in issue.key:
-            pass
-
-        if fields["issuetype"]["subtask"] if isinstance(fields, dict) else fields.issuetype.subtask:
-            return JiraSubtask(
-            **base_kwargs,
-            parent_key=fields["parent"]["key"] if isinstance(fields, dict) else fields.parent.key,
-            parent_summary=fields["parent"]["fields"]["summary"] if isinstance(fields, dict) else fields.parent.fields.summary,
-            )
-        elif (fields["issuetype"]["name"] if isinstance(fields, dict) else fields.issuetype.name) == "Epic":
-            return JiraEpic(**base_kwargs)
-        elif (fields["issuetype"]["name"] if isinstance(fields, dict) else fields.issuetype.name) in ("Story", "Innovation"):
-            return JiraStory(**base_kwargs)
-        elif (fields["issuetype"]["name"] if isinstance(fields, dict) else fields.issuetype.name) == "Task":
-            if ("parent" in fields and fields["parent"]) if isinstance(fields, dict) else (hasattr(fields, "parent") and fields.parent):
-                return JiraTask(
-                    **base_kwargs,
-                    parent_key=fields["parent"]["key"] if isinstance(fields, dict) else fields.parent.key,
-                    parent_summary=fields["parent"]["fields"]["summary"] if isinstance(fields, dict) else fields.parent.fields.summary,
-                )
-            return JiraTask(**base_kwargs)
-        elif (fields["issuetype"]["name"] if isinstance(fields, dict) else fields.issuetype.name) == "Bug":
-            return JiraBug(
-            **base_kwargs,
-            fixed=fields["fixVersions"] if isinstance(fields, dict) else fields.fixVersions,
+        issuetype = fields["issuetype"]
+        cls = JiraSubtask if issuetype["subtask"] else ISSUE_CLASSES.get(issuetype["name"], JiraBaseIssue)
+        parent = fields.get("parent")
+        if cls is JiraSubtask or (cls is JiraTask and parent):
+            base_kwargs["parent_key"] = parent["key"]
+            base_kwargs["parent_summary"] = parent["fields"]["summary"]
+        elif cls is JiraBug:
+            base_kwargs["fixed"] = fields.get("fixVersions") or []
+        elif cls is JiraBaseIssue:
+            logger.warning(
+                "Unhandled type of %s is: %s of Element: %s",
+                key,
+                issuetype["name"],
+                fields.get("summary"),
             )
-
-        logger.warning(
-            "Unhandled type of %s is: %s of Element: %s",
-            issue.key,
-            fields.issuetype.name,
-            fields.summary,
-        )
-        return JiraBaseIssue(**base_kwargs)
+        return cls.from_fields(raw_worklog=fields.get("worklog"), **base_kwargs)
@@ -1,5 +1,6 @@
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict, Type, Any
 from jira import JIRA
 from model.jira_models import (
@@ -14,18 +15,60 @@ from jira_tools import JiraFactory
 from lib.logger import logger
 from config import Config
 
-def fetch_issues(jira_client: JIRA, jql: str) -> List[Any]:
-    issues = []
-    start_at = 0
-    max_results = 50
-    while True:
-        batch = jira_client.search_issues(jql, startAt=start_at, maxResults=max_results)
-        if not batch:
-            break
-        issues.extend(batch)
-        if len(batch) < max_results:
-            break
-        start_at += max_results
+# The fields read by JiraFactory.create_issue; all other fields are not requested from Jira.
+ISSUE_FIELDS = ",".join([
+    "summary", "description", "status", "project", "issuetype", "assignee", "reporter",
+    "subtasks", "created", "updated", "timespent", "worklog", "attachment", "parent",
+    "fixVersions",
+])
+# The page size of /search (the maximum accepted by Jira Cloud).
+SEARCH_PAGE_SIZE = 100
+# The number of /search pages requested concurrently once the total is known.
+FETCH_WORKERS = 6
+# From this many issues on, parsing (CPU-bound validation) is spread over processes;
+# below it, starting the workers costs more than it saves.
+PARALLEL_PARSE_MIN_ISSUES = 200
+
+def search_page(jira_client: JIRA, jql: str, start_at: int) -> Dict[str, Any]:
+    """
+    Requests one page of /search and returns the raw JSON response.
+
+    json_result=True skips building python-jira Issue resources for the page.
+
+    Returns:
+        Dict[str, Any]: The response with the raw "issues" and their "total".
+    """
+    return jira_client.search_issues(
+        jql,
+        startAt=start_at,
+        maxResults=SEARCH_PAGE_SIZE,
+        fields=ISSUE_FIELDS,
+        json_result=True,
+    )
+
+def fetch_issues(jira_client: JIRA, jql: str) -> List[Dict[str, Any]]:
+    def fetch_page(start_at: int):
+        return search_page(jira_client, jql, start_at)["issues"]
+
+    first = search_page(jira_client, jql, 0)
+    issues = list(first["issues"])
+    # The server may cap the page size below the requested one.
+    page_size = first.get("maxResults") or SEARCH_PAGE_SIZE
+    total = first.get("total")
+
+    if total is None:
+        # No total in the response: page sequentially.
+        batch = issues
+        while len(batch) >= page_size:
+            batch = fetch_page(len(issues))
+            issues.extend(batch)
+        return issues
+
+    offsets = range(len(issues), total, page_size)
+    if offsets:
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(offsets))) as executor:
+            for batch in executor.map(fetch_page, offsets):
+                issues.extend(batch)
     return issues
 
 class JiraHandler:
@@ -43,7 +86,15 @@ class JiraHandler:
 
     def fetch_and_parse_issues(self, jql: str) -> List[JiraBaseIssue]:
         issues = fetch_issues(self.jira_client, jql=jql)
-        parsed_issues = [JiraFactory.create_issue(issue) for issue in issues]
+        JiraFactory.reset_user_cache()
+        workers = os.cpu_count() or 1
+        if len(issues) < PARALLEL_PARSE_MIN_ISSUES or workers == 1:
+            parsed_issues = [JiraFactory.create_issue(issue) for issue in issues]
+        else:
+            # The raw issue dicts pickle cheaply; a few chunks per worker amortize the IPC.
+            chunksize = max(1, len(issues) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed_issues = list(pool.map(JiraFactory.create_issue, issues, chunksize=chunksize))
         logger.info("Parsed %d issues", len(parsed_issues))
         return parsed_issues
 
@@ -56,11 +107,12 @@ class JiraHandler:
             JiraEpic: "epics",
         }
         categorized_issues = {name: [] for name in issue_types.values()}
+        # JiraFactory.create_issue returns exactly these classes, so the concrete type
+        # selects the bucket with one dict lookup instead of a chain of isinstance checks.
         for issue in parsed_issues:
-            for cls, name in issue_types.items():
-                if isinstance(issue, cls):
-                    categorized_issues[name].append(issue)
-                    break
+            name = issue_types.get(type(issue))
+            if name:
+                categorized_issues[name].append(issue)
         return categorized_issues
 
     def get_client(self) -> JIRA:
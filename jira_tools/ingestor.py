@@ -5,102 +5,78 @@ related to Jira issues and subtasks.
 It also includes logging to track the success or failure of these operations.
 """
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import List
 from db.vectordb_client import VectorDB
 from model.jira_models import JiraStory, JiraSubtask, JiraBug, JiraTask, JiraBaseIssue, JiraEpic
 from lib.logger import logger
 from psycopg2 import DatabaseError
 
+# Rows embedded per worker task; each task sends a single request for the summaries
+# and descriptions together.
+EMBED_CHUNK_SIZE = 64
+
+# Insert statement of each issue type, looked up by the exact type of the issue.
+ISSUE_STATEMENTS = {
+    JiraSubtask: "insert_jira_subtask",
+    JiraTask: "insert_jira_task",
+    JiraEpic: "insert_jira_task",
+    JiraStory: "insert_jira_task",
+    JiraBug: "insert_jira_bug",
+}
+
+
+def _to_utc(value):
+    """
+    Converts a timezone-aware datetime to naive UTC, as the timestamp columns store no
+    time zone. Every insert path (COPY, execute_values, prepared) gets the same value.
+    """
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 
 class JiraIngestor:
     """
     A class responsible for ingesting Jira issues and subtasks into a vector database.
     """
 
-    def __init__(self, client: VectorDB):
+    def __init__(self, client: VectorDB, concurrency: int = 8, batch_size: int = 500):
         """
         Initialize the JiraIngestor with a VectorDB client.
 
         Args:
             client (VectorDB): The vector database client used for storing Jira data.
+            concurrency (int): The number of embedding requests running in parallel during bulk ingest.
+            batch_size (int): The number of rows written per bulk insert.
         """
         self.client = client
+        self.concurrency = concurrency
+        self.batch_size = batch_size
 
     def ingest_issue(self, issue):
         """
         Inserts the issue into the appropriate table depending on its type.
         Supports JiraIssue, JiraTask, JiraBug, JiraSubtask, JiraEpic, etc.
         """
-
-        def sql_escape(value):
-            return str(value).replace("'", "''") if value else ""
-
         try:
-            summary_embedding = self.client.create_embedding(issue.summary)
+            statement_name, columns = self._issue_row(issue)
             if not issue.description or not isinstance(issue.description, str):
                 logger.error("Invalid text input: %s for %s (%s)", issue.description, issue.key, issue.to_string())
-            description_embedding = self.client.create_embedding(issue.description)
-
             if isinstance(issue, JiraSubtask):
                 logger.debug("Ingesting subtask %s with parent %s", issue.key, issue.parent_key)
-                self.client.execute_sql("insert_jira_subtask",
-                    key=issue.key,
-                    parent_key=issue.parent_key,
-                    summary=sql_escape(issue.summary),
-                    summary_vector=summary_embedding,
-                    description=sql_escape(issue.description),
-                    description_vector=description_embedding,
-                    status=issue.status,
-                    status_category=issue.statusCategory,
-                    assignee=issue.assignee.displayName if issue.assignee else "",
-                    created=issue.created,
-                    updated=issue.updated,
-                    time_spent_seconds=issue.timeSpentSeconds or 0,
-                    url=str(issue.url)
-                )
-
-            elif isinstance(issue, JiraTask) or isinstance(issue, JiraEpic) or isinstance(issue, JiraStory):
-                self.client.execute_sql("insert_jira_task",
-                    key=issue.key,
-                    summary=sql_escape(issue.summary),
-                    summary_vector=summary_embedding,
-                    description=sql_escape(issue.description),
-                    description_vector=description_embedding,
-                    issue_type=issue.issue_type,
-                    status=issue.status,
-                    status_category=issue.statusCategory,
-                    parent_key=issue.parent_key if hasattr(issue, 'parent_key') else None,
-                    project=issue.project,
-                    assignee=issue.assignee.displayName if issue.assignee else "",
-                    reporter=issue.reporter.displayName if issue.reporter else "",
-                    created=issue.created,
-                    updated=issue.updated,
-                    time_spent_seconds=issue.timeSpentSeconds or 0,
-                    url=str(issue.url)
-                )
-
-            elif isinstance(issue, JiraBug):
-                self.client.execute_sql("insert_jira_bug",
-                    key=issue.key,
-                    summary=sql_escape(issue.summary),
-                    summary_vector=summary_embedding,
-                    description=sql_escape(issue.description),
-                    description_vector=description_embedding,
-                    issue_type=issue.issue_type,
-                    status=issue.status,
-                    status_category=issue.statusCategory,
-                    project=issue.project,
-                    assignee=issue.assignee.displayName if issue.assignee else "",
-                    reporter=issue.reporter.displayName if issue.reporter else "",
-                    created=issue.created,
-                    updated=issue.updated,
-                    time_spent_seconds=issue.timeSpentSeconds or 0,
-                    url=str(issue.url)
-                )
-
-            else:
-                raise ValueError(f"Unsupported issue type: {type(issue).__name__}")
 
+            summary_vector, description_vector = self.client.create_embedding(
+                [issue.summary, issue.description]
+            )
+            self.client.store_text(
+                statement_name,
+                summary_vector=summary_vector,
+                description_vector=description_vector,
+                **columns
+            )
             logger.info("Ingested %s: %s", type(issue).__name__, issue.key)
 
         except (AttributeError, KeyError, ValueError, TypeError, RuntimeError) as e:
@@ -108,7 +84,109 @@ class JiraIngestor:
         except DatabaseError as db_err:
             logger.error("Database error while ingesting %s %s: %s", 
                          issue.__class__.__name__, issue.key, db_err)
+            raise
+
+    @staticmethod
+    def _issue_row(issue):
+        """
+        Maps an issue to the insert statement of its table and the column values
+        (without the embedding vectors). The user names are computed here once per
+        issue; issues are frozen, so they cannot go stale.
+
+        Returns:
+            tuple: (statement name, dict of column values)
+
+        Raises:
+            ValueError: If the issue type is not supported.
+        """
+        statement_name = ISSUE_STATEMENTS.get(type(issue))
+        if statement_name is None:
+            raise ValueError(f"Unsupported issue type: {type(issue).__name__}")
+
+        columns = {
+            "key": issue.key,
+            "summary": issue.summary,
+            "description": issue.description,
+            "status": issue.status,
+            "status_category": issue.statusCategory,
+            "assignee": issue.assignee.displayName if issue.assignee else "",
+            "created": _to_utc(issue.created),
+            "updated": _to_utc(issue.updated),
+            "time_spent_seconds": issue.timeSpentSeconds or 0,
+            "url": issue.url,
+        }
+        if statement_name != "insert_jira_subtask":
+            columns.update(
+                issue_type=issue.issue_type,
+                project=issue.project,
+                reporter=issue.reporter.displayName if issue.reporter else "",
+            )
+        if statement_name != "insert_jira_bug":
+            columns["parent_key"] = getattr(issue, "parent_key", None)
+        return statement_name, columns
+
+    def _embed_texts(self, texts):
+        """
+        Embeds all non-empty texts with batched requests. Empty texts get no vector (None).
+        """
+        valid = [text for text in texts if text and isinstance(text, str)]
+        vectors = iter(self.client.create_embedding(valid) if valid else [])
+        return [next(vectors) if text and isinstance(text, str) else None for text in texts]
+
+    def _ingest_rows(self, issues):
+        """
+        Embeds the given issues in batches and stores them with one bulk insert per table.
+        Issues that cannot be mapped to a row are logged and skipped.
+        """
+        rows_by_statement = {}
+        for issue in issues:
+            try:
+                statement_name, columns = self._issue_row(issue)
+                rows_by_statement.setdefault(statement_name, []).append(columns)
+            except (AttributeError, ValueError) as e:
+                logger.error("Failed to ingest issue %s: %s", getattr(issue, "key", issue), e)
 
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for statement_name, rows in rows_by_statement.items():
+                self._embed_and_store(executor, statement_name, rows)
+                logger.info("Ingested %d rows with %s", len(rows), statement_name)
+
+    def _embed_rows(self, rows):
+        """
+        Adds the summary and description vectors to the rows, embedding both texts of
+        all rows with one batched call.
+        """
+        vectors = self._embed_texts(
+            [row["summary"] for row in rows] + [row["description"] for row in rows]
+        )
+        summary_vectors, description_vectors = vectors[:len(rows)], vectors[len(rows):]
+        for row, summary_vector, description_vector in zip(rows, summary_vectors, description_vectors):
+            row.update(summary_vector=summary_vector, description_vector=description_vector)
+        return rows
+
+    def _embed_and_store(self, executor, statement_name, rows):
+        """
+        Embeds chunks of rows on the executor's worker threads while the calling thread
+        writes the finished rows in batches of batch_size. At most 2 * concurrency chunks
+        are in flight, which bounds the memory held by embedded but unwritten rows.
+        """
+        pending = deque()
+        buffer = []
+
+        def collect():
+            buffer.extend(pending.popleft().result())
+            if len(buffer) >= self.batch_size:
+                self.client.store_texts_bulk(statement_name, buffer)
+                buffer.clear()
+
+        for start in range(0, len(rows), EMBED_CHUNK_SIZE):
+            pending.append(executor.submit(self._embed_rows, rows[start:start + EMBED_CHUNK_SIZE]))
+            if len(pending) >= 2 * self.concurrency:
+                collect()
+        while pending:
+            collect()
+        if buffer:
+            self.client.store_texts_bulk(statement_name, buffer)
 
     def ingest_subtask(self, subtask: JiraSubtask):
         """
@@ -121,23 +199,16 @@ class JiraIngestor:
             Logs success or failure of the ingestion process.
         """
         try:
-            summary_embedding = self.client.create_embedding(subtask.summary)
-            description_embedding = self.client.create_embedding(subtask.description)
+            statement_name, columns = self._issue_row(subtask)
+            summary_embedding, description_embedding = self.client.create_embedding(
+                [subtask.summary, subtask.description]
+            )
 
-            self.client.execute_sql("insert_jira_subtask",
-                key=subtask.key,
-                parent_key=subtask.parent_key,
-                summary=subtask.summary.replace("'", "''"),
+            self.client.store_text(
+                statement_name,
                 summary_vector=summary_embedding,
-                description=subtask.description.replace("'", "''"),
                 description_vector=description_embedding,
-                status=subtask.status,
-                status_category=subtask.statusCategory,
-                assignee=subtask.assignee.displayName if subtask.assignee else "",
-                created=subtask.created,
-                updated=subtask.updated,
-                time_spent_seconds=subtask.timeSpentSeconds or 0,
-                url=str(subtask.url)
+                **columns
             )
             logger.info("Ingested Jira Subtask: %s", subtask.key)
         except AttributeError as e:
@@ -156,10 +227,14 @@ class JiraIngestor:
         stories: List[JiraStory],
         subtasks: List[JiraSubtask],
         bugs: List[JiraBug],
-        tasks: List[JiraTask]
+        tasks: List[JiraTask],
+        synchronous_commit: bool = True
     ):
         """
         Ingest multiple Jira issues and subtasks into the vector database in correct dependency order.
+        Texts are embedded in batches by concurrent workers while the calling thread fills
+        each table with multi-row inserts, all in a single transaction. A database error rolls back the whole batch and is
+        re-raised; issues that cannot be mapped to a row are logged and skipped.
 
         Order:
             1. Epics
@@ -172,36 +247,34 @@ class JiraIngestor:
             subtasks (List[JiraSubtask]): A list of Jira subtasks.
             bugs (List[JiraBug]): A list of Jira bugs.
             tasks (List[JiraTask]): A list of Jira tasks.
+            synchronous_commit (bool): If False, the commit does not wait for the WAL flush.
+                Suitable for re-runnable loads where losing the last commit on a server crash is acceptable.
 
         Logs:
             Logs success or failure of the ingestion process for each issue and subtask.
         """
 
-        # 1. Epics
-        for epic in epics:
-            try:
-                self.ingest_issue(epic)
-            except (ValueError, DatabaseError) as e:
-                logger.error("Failed to ingest epic %s: %s", epic.key, e)
+        try:
+            with self.client.transaction(synchronous_commit=synchronous_commit):
+                # 1. Epics
+                self._ingest_rows(epics)
 
-        # 2. Stories, Tasks, Bugs
-        for issue in stories + tasks + bugs:
-            try:
-                self.ingest_issue(issue)
-            except (ValueError, DatabaseError) as e:
-                logger.error("Failed to ingest issue %s: %s", issue.key, e)
+                # 2. Stories, Tasks, Bugs
+                self._ingest_rows(stories + tasks + bugs)
 
-        # 3. Subtasks
-        for subtask in subtasks:
-            try:
-                parent_issue_exists = self.client.execute_sql(
-                    "issue_exists",
-                    key=subtask.parent_key
-                )
-                if parent_issue_exists[0][0]:
-                    self.ingest_subtask(subtask)
-                else:
-                    logger.warning("Parent issue %s not found for subtask %s",
-                                subtask.parent_key, subtask.key)
-            except (KeyError, DatabaseError) as e:
-                logger.error("Failed to ingest subtask %s: %s", subtask.key, e)
\ No newline at end of file
+                # 3. Subtasks (the parents are checked with one query instead of one per subtask)
+                parent_keys = sorted({subtask.parent_key for subtask in subtasks if subtask.parent_key})
+                existing_parents = {
+                    row[0] for row in self.client.execute_sql("existing_issue_keys", keys=parent_keys)
+                } if parent_keys else set()
+                ready_subtasks = []
+                for subtask in subtasks:
+                    if subtask.parent_key in existing_parents:
+                        ready_subtasks.append(subtask)
+                    else:
+                        logger.warning("Parent issue %s not found for subtask %s",
+                                    subtask.parent_key, subtask.key)
+                self._ingest_rows(ready_subtasks)
+        except DatabaseError as e:
+            logger.error("Bulk ingest rolled back: %s", e)
+            raise
@@ -1,5 +1,8 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from .project_path import SystemPath
 
 logging.basicConfig(level=logging.INFO)
@@ -10,7 +13,6 @@ file_handler = logging.FileHandler(log_file_path)
 file_handler.setLevel(logging.INFO)
 file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s')
 file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
 
 # === agent_logger ===
 
@@ -22,4 +24,40 @@ agent_file_handler = logging.FileHandler(agent_log_file_path)
 agent_file_handler.setLevel(logging.INFO)
 agent_file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s')
 agent_file_handler.setFormatter(agent_file_formatter)
-agent_logger.addHandler(agent_file_handler)
+
+# === file writes off the calling thread ===
+
+# The loggers only put records on a queue; a listener thread writes them to the files,
+# so no ingest or agent thread waits for disk I/O.
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+logger.addHandler(_queue_handler)
+agent_logger.addHandler(_queue_handler)
+_listener = QueueListener(_log_queue, file_handler, agent_file_handler, respect_handler_level=True)
+
+
+def _route_to_file(record: logging.LogRecord) -> bool:
+    """
+    Sends each record of the shared queue only to the file of its logger.
+    """
+    return record.name != agent_logger.name
+
+
+file_handler.addFilter(_route_to_file)
+agent_file_handler.addFilter(lambda record: not _route_to_file(record))
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def _log_synchronously():
+    """
+    Forked worker processes (e.g. the parse pool) have no listener thread, so they
+    write to the files directly.
+    """
+    for log, handler in ((logger, file_handler), (agent_logger, agent_file_handler)):
+        log.removeHandler(_queue_handler)
+        log.addHandler(handler)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_log_synchronously)
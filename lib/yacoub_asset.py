@@ -6,10 +6,38 @@ It also includes a function to generate a URL with query parameters for the requ
 
 import urllib.parse
 import time
+from functools import lru_cache
 import requests
 import jwt
 from cryptography.hazmat.primitives import serialization
 
+# Shared by all requests, so that connections to the asset server are kept alive
+# instead of being opened (with a TLS handshake) per request.
+_SESSION = requests.Session()
+
+
+@lru_cache(maxsize=32)
+def _load_key(user, password=None):
+    """
+    Loads the SSH private key of the user from the credentials directory. The key is
+    parsed once per user and reused for every request.
+    """
+    with open(f"credentials/{user}", "rb") as key_file:
+        return serialization.load_ssh_private_key(key_file.read(), password)
+
+
+@lru_cache(maxsize=32)
+def _private_key_pem(user) -> str:
+    """
+    Returns the user's private key as PKCS8 PEM, the form the JWT is signed with.
+    The key never changes, so it is serialized once per user.
+    """
+    return _load_key(user).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
 
 def send_request(url, asset, user, file=None):
     """
@@ -21,36 +49,29 @@ def send_request(url, asset, user, file=None):
         url (str): The base URL to send the request to.
         asset (str): The asset identifier to include in the URL.
         user (str): The username for authentication.
-        file (str, optional): The path to the file to be sent in a POST request.
+        file (str | tuple, optional): The path to the file to be sent in a POST request,
+        or a (filename, file object) tuple for content that is already in memory.
         Defaults to None.
         
         Returns:
             requests.Response: The response object from the request.
     """
     def generate_url(url, asset, user, **kwargs):
-        def load_key(path, password=None):
-            return serialization.load_ssh_private_key(open(path, "rb").read(), password)
-
-        def sign_jwt(user, key):
+        def sign_jwt(user, pem):
             return jwt.encode(
                 {"username": user, "timestamp": str(time.time())},
-                key.private_bytes(
-                    serialization.Encoding.PEM,
-                    serialization.PrivateFormat.PKCS8,
-                    serialization.NoEncryption(),
-                ).decode(),
+                pem,
                 algorithm="EdDSA",
             )
 
-        key = load_key(f"credentials/{user}")
-        token = urllib.parse.quote(sign_jwt(user, key))
+        token = urllib.parse.quote(sign_jwt(user, _private_key_pem(user)))
         url += ("?" if "?" not in url else "&") + f"asset={asset}&html=1&user={user}"
         url += "".join(f"&{k}={urllib.parse.quote(v)}" for k, v in kwargs.items())
         return f"{url}&auth={token}"
 
-    files = {"file": open(file, "rb")} if file else None
-    return (
-        requests.post(generate_url(url, asset, user), files=files, timeout=10)
-        if file
-        else requests.get(generate_url(url, asset, user), timeout=10)
-    )
+    if isinstance(file, str):
+        with open(file, "rb") as file_obj:
+            return _SESSION.post(generate_url(url, asset, user), files={"file": file_obj}, timeout=10)
+    if file:
+        return _SESSION.post(generate_url(url, asset, user), files={"file": file}, timeout=10)
+    return _SESSION.get(generate_url(url, asset, user), timeout=10)
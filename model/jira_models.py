@@ -5,9 +5,14 @@ for generating string representations.
 """
 
 from datetime import datetime
+from functools import cached_property
 from textwrap import indent
 from typing import Optional, List, Any
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field, PrivateAttr, field_validator
+
+# Models built for every parsed issue validate the raw Jira JSON (or python-jira
+# resources) directly and drop the fields they do not declare.
+_RAW_JIRA_CONFIG = ConfigDict(from_attributes=True, extra='ignore')
 
 
 class JiraUser(BaseModel):
@@ -18,9 +23,16 @@ class JiraUser(BaseModel):
         displayName (str): The display name of the user.
         emailAddress (str): The email address of the user.
     """
+    model_config = _RAW_JIRA_CONFIG
 
     displayName: str
-    emailAddress: str
+    emailAddress: str = "No person assigned."
+
+    @field_validator("emailAddress", mode="before")
+    @classmethod
+    def _default_email(cls, value):
+        # Jira hides the address of many users by returning null or an empty string.
+        return value or "No person assigned."
 
     def __str__(self) -> str:
         return f"{self.displayName} <{self.emailAddress}>"
@@ -41,6 +53,7 @@ class JiraWorklog(BaseModel):
         timeSpent (str): The time spent on the worklog in human-readable format.
         timeSpentSeconds (int): The time spent on the worklog in seconds.
     """
+    model_config = _RAW_JIRA_CONFIG
 
     started: datetime
     timeSpent: str
@@ -66,6 +79,8 @@ class Author(BaseModel):
         accountId (str): The account ID of the author.
         displayName (str): The display name of the author.
     """
+    model_config = _RAW_JIRA_CONFIG
+
     accountId: str
     displayName: str
 
@@ -103,7 +118,10 @@ class JiraAttachement(BaseModel):
         size (int): The size of the attachment in bytes.
         mimeType (str): The MIME type of the attachment.
         content (HttpUrl): The URL to the content of the attachment.
+        sha256 (str | None): The SHA-256 of the content, set once it was downloaded.
     """
+    model_config = _RAW_JIRA_CONFIG
+
     id: str
     filename: str
     author: Author
@@ -111,6 +129,15 @@ class JiraAttachement(BaseModel):
     size: int
     mimeType: str
     content: HttpUrl
+    sha256: str | None = Field(default=None, exclude=True)
+
+    @cached_property
+    def extension(self) -> str:
+        """
+        The lower-case file extension of the attachment (empty if the name has none).
+        """
+        _, dot, extension = self.filename.rpartition(".")
+        return extension.lower() if dot else ""
 
     def to_string(self, detailed: bool = False) -> str:
         """
@@ -136,19 +163,25 @@ class JiraAttachement(BaseModel):
     def __str__(self):
         return self.to_string(detailed=False)
 
-    def get_content(self, jira_client) -> str:
+    def stream_content(self, jira_client, chunk_size: int = 65536):
         """
-        Fetches the content of the attachment.
+        Streams the content of the attachment.
+
+        Args:
+            jira_client: The connected Jira client.
+            chunk_size (int): The size of the chunks read from the response.
+
+        Returns:
+            Iterator[bytes]: The content in chunks, read from the network as they are consumed.
         """
         key = str(self.content).split("/")[-1]
-        content = jira_client.attachment(key)
-        attachement_bytes = []
-
-        for chunk in content.iter_content(chunk_size=8192):
-            attachement_bytes.append(chunk)
+        return jira_client.attachment(key).iter_content(chunk_size=chunk_size)
 
-        content_bytes = b"".join(attachement_bytes)
-        return content_bytes
+    def get_content(self, jira_client) -> bytes:
+        """
+        Fetches the content of the attachment.
+        """
+        return b"".join(self.stream_content(jira_client))
 
 
 class JiraBaseIssue(BaseModel):
@@ -168,10 +201,15 @@ class JiraBaseIssue(BaseModel):
         created (datetime): The creation timestamp of the issue.
         updated (datetime): The last updated timestamp of the issue.
         timeSpentSeconds (Optional[int]): The total time spent on the issue in seconds.
-        url (HttpUrl): The URL to the issue in Jira.
-        worklogs (List[JiraWorklog]): A list of worklogs associated with the issue.
+        url (str): The URL to the issue in Jira (the issue's REST self link).
+        worklogs (List[JiraWorklog]): A list of worklogs associated with the issue,
+            parsed from the raw Jira worklog on first access.
     """
 
+    # Issues are not modified after parsing. Freezing them keeps the values derived once
+    # per issue (the cached worklogs and strings, the insert rows) consistent with the fields.
+    model_config = ConfigDict(frozen=True)
+
     key: str
     summary: str
     description: str
@@ -185,10 +223,52 @@ class JiraBaseIssue(BaseModel):
     created: datetime
     updated: datetime
     timeSpentSeconds: Optional[int]
-    url: HttpUrl
-    worklogs: List[JiraWorklog] = Field(default_factory=list)
+    # Jira's own self link; validating it as HttpUrl cost more than any other issue field.
+    url: str
     attachments: List[JiraAttachement] = Field(default_factory=list)
 
+    # The raw "worklog" field of the issue ({"worklogs": [...]}), see worklogs.
+    _raw_worklog: dict = PrivateAttr(default_factory=dict)
+
+    @cached_property
+    def worklogs(self) -> List[JiraWorklog]:
+        """
+        The worklogs of the issue. Most issues are stored without their worklogs being
+        read, so they are only validated when accessed.
+        """
+        return [JiraWorklog.model_validate(w) for w in self._raw_worklog.get("worklogs", [])]
+
+    @classmethod
+    def from_fields(cls, raw_worklog: Optional[dict] = None, **fields):
+        """
+        Creates the issue from its field values, keeping the raw "worklog" field of the
+        issue to be validated on first access of worklogs.
+
+        Args:
+            raw_worklog (Optional[dict]): The raw "worklog" field ({"worklogs": [...]}).
+            **fields: The field values of the issue.
+
+        Returns:
+            JiraBaseIssue: The issue, of the class this is called on.
+        """
+        issue = cls(**fields)
+        issue._raw_worklog = raw_worklog or {}
+        return issue
+
+    @cached_property
+    def short_string(self) -> str:
+        """
+        The one-line form "[key] summary (status)". Issues are frozen, so it is built once.
+        """
+        return f"[{self.key}] {self.summary} ({self.status})"
+
+    @cached_property
+    def subtask_lines(self) -> str:
+        """
+        The subtask keys as the indented list of the detailed form, built once.
+        """
+        return "\n".join(f"      - {key}" for key in self.subtasks)
+
     def __str__(self) -> str:
         """
         Returns a string representation of the issue.
@@ -205,22 +285,31 @@ class JiraBaseIssue(BaseModel):
         Returns:
             str: The string representation of the issue.
         """
-        base = f"[{self.key}] {self.summary} ({self.status})"
+        base = self.short_string
         if not detailed:
             return base
-        details = [
-            f"Description: {self.description}",
-            f"Type:        {self.issue_type}",
-            f"Project:     {self.project}",
-            f"Status Cat.: {self.statusCategory}",
-            f"Assignee:    {self.assignee.displayName if self.assignee else '-'}",
-            f"Reporter:    {self.reporter.displayName if self.reporter else '-'}",
-            f"Created:     {self.created}",
-            f"Updated:     {self.updated}",
-            f"Time Spent:  {self.timeSpentSeconds // 3600 if self.timeSpentSeconds else 0}h",
-            f"Link:        {self.url}",
-        ]
-        return base + "\n" + indent("\n".join(details), prefix="  ")
+        assignee = self.assignee.displayName if self.assignee else '-'
+        reporter = self.reporter.displayName if self.reporter else '-'
+        hours = self.timeSpentSeconds // 3600 if self.timeSpentSeconds else 0
+        # Only the description spans several lines; its continuation lines are indented as
+        # well. textwrap.indent costs more than the rest of the string, so single lines skip it.
+        description = f"Description: {self.description}"
+        if "\n" in description or "\r" in description:
+            description = indent(description, prefix="  ")
+        else:
+            description = "  " + description
+        return (
+            f"{base}\n{description}\n"
+            f"  Type:        {self.issue_type}\n"
+            f"  Project:     {self.project}\n"
+            f"  Status Cat.: {self.statusCategory}\n"
+            f"  Assignee:    {assignee}\n"
+            f"  Reporter:    {reporter}\n"
+            f"  Created:     {self.created}\n"
+            f"  Updated:     {self.updated}\n"
+            f"  Time Spent:  {hours}h\n"
+            f"  Link:        {self.url}"
+        )
 
 
 class JiraSubtask(JiraBaseIssue):
@@ -247,8 +336,7 @@ class JiraSubtask(JiraBaseIssue):
         """
         base = super().to_string(detailed)
         if detailed:
-            parent = f"Parent:      [{self.parent_key}] {self.parent_summary}"
-            return base + "\n" + indent(parent, prefix="  ")
+            return f"{base}\n  Parent:      [{self.parent_key}] {self.parent_summary}"
         return base
 
 
@@ -257,7 +345,7 @@ class JiraStory(JiraBaseIssue):
     Represents a Jira story, which may contain subtasks.
 
     Attributes:
-        subtasks (List[JiraSubtask]): A list of subtasks associated with the story.
+        subtasks (List[str]): The keys of the subtasks associated with the story.
     """
 
     def to_string(self, detailed: bool = False) -> str:
@@ -272,10 +360,7 @@ class JiraStory(JiraBaseIssue):
         """
         base = super().to_string(detailed)
         if detailed and self.subtasks:
-            subs = "\n".join(
-                f"  - {s.to_string(detailed=False)}" for s in self.subtasks
-            )
-            return base + "\n  Subtasks:\n" + indent(subs, "    ")
+            return f"{base}\n  Subtasks:\n{self.subtask_lines}"
         return base
 
 class JiraTask(JiraBaseIssue):
@@ -283,7 +368,7 @@ class JiraTask(JiraBaseIssue):
     Represents a Jira task, which is a specialized type of issue.
 
     Attributes:
-        subtasks (List[JiraSubtask]): A list of subtasks associated with the task.
+        subtasks (List[str]): The keys of the subtasks associated with the task.
     """
 
     parent_key: Optional[str] = None
@@ -301,10 +386,7 @@ class JiraTask(JiraBaseIssue):
         """
         base = super().to_string(detailed)
         if detailed and self.subtasks:
-            subs = "\n".join(
-                f"  - {s.to_string(detailed=False)}" for s in self.subtasks
-            )
-            return base + "\n  Subtasks:\n" + indent(subs, "    ")
+            return f"{base}\n  Subtasks:\n{self.subtask_lines}"
         return base
 
 class JiraBug(JiraBaseIssue):
@@ -312,7 +394,7 @@ class JiraBug(JiraBaseIssue):
     Represents a Jira bug, which is a specialized type of issue.
 
     Attributes:
-        subtasks (List[JiraSubtask]): A list of subtasks associated with the bug.
+        subtasks (List[str]): The keys of the subtasks associated with the bug.
     """
 
     fixed: List[Any] = Field(default_factory=list)
@@ -329,10 +411,7 @@ class JiraBug(JiraBaseIssue):
         """
         base = super().to_string(detailed)
         if detailed and self.subtasks:
-            subs = "\n".join(
-                f"  - {s.to_string(detailed=False)}" for s in self.subtasks
-            )
-            return base + "\n  Subtasks:\n" + indent(subs, "    ")
+            return f"{base}\n  Subtasks:\n{self.subtask_lines}"
         return base
 
 
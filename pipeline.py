@@ -6,9 +6,12 @@ It also includes logging to track the success or failure of these operations.
 """
 
 from typing import List
+import orjson
 from jira_tools import JiraHandler, JiraIngestor, AttachementHandler
-from db import VectorDB, DBConfig
+from db import VectorDB, DBConfig, bulk_ingest
 from lib.logger import logger
+from lib.project_path import ProjectPath
+from config import Config
 
 # ------------------------------------------------------------------------------
 # Main Execution
@@ -39,33 +42,35 @@ def main():
         len(epics) + len(stories) + len(tasks) + len(subtasks) + len(bugs),
     )
 
-    import json
-    issue_data167 = [
-        issue for issue in parsed_issues if issue.key == "DATA-167"
-    ][0]
-
-    return
-    attachement_hdlr = AttachementHandler(jira_client)
-    print(json.dumps(attachement_hdlr.process_attachements(
-        issue_data167, save_file=True
-    )))
-    # for categorized_issues in parsed_issues:
-    #     attachement_hdlr.process_attachements(
-    #         categorized_issues, save_file=True
-    #     )
-
-
     # Initialize DB and ingest
-    db_client = VectorDB(
+    config = Config.load_from_env()
+    with VectorDB(
         DBConfig(
             dbname=config.pg_dbname,
             user=config.pg_user,
             password=config.pg_password,
             host=config.pg_host,
+            embedding_cache_path=ProjectPath.absolute(ProjectPath.local('[]/tmp/embedding_cache.sqlite')),
         )
-    )
-    ingestor = JiraIngestor(db_client)
-    ingestor.ingest_bulk(epics=epics, stories=stories, subtasks=subtasks, bugs=bugs, tasks=tasks)
+    ) as db_client:
+        ingestor = JiraIngestor(db_client)
+        with bulk_ingest(db_client):
+            # The sync can be re-run, so the commit does not need to wait for the WAL flush.
+            ingestor.ingest_bulk(
+                epics=epics, stories=stories, subtasks=subtasks, bugs=bugs, tasks=tasks,
+                synchronous_commit=False,
+            )
+
+    issue_data167 = next((issue for issue in parsed_issues if issue.key == "DATA-167"), None)
+    if issue_data167 is not None:
+        attachement_hdlr = AttachementHandler(jira_client)
+        print(orjson.dumps(attachement_hdlr.process_attachements(
+            issue_data167, save_file=True
+        )).decode())
+    # for categorized_issues in parsed_issues:
+    #     attachement_hdlr.process_attachements(
+    #         categorized_issues, save_file=True
+    #     )
 
 
 # ------------------------------------------------------------------------------
@@ -73,13 +78,14 @@ def main():
 # ------------------------------------------------------------------------------
 
 
-def print_issues(title: str, issues: List):
+def print_issues(title: str, issues: List, detailed: bool = True):
     """
-    Print a list of issues with a given title.
+    Print a list of issues with a given title. With detailed=False only the
+    cached one-line form of each issue is printed.
     """
     print(f"\n{title}:")
     for issue in issues:
-        print(issue.to_string(detailed=True))
+        print(issue.to_string(detailed=detailed))
 
 
 # ------------------------------------------------------------------------------
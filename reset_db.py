@@ -10,22 +10,31 @@ from dotenv import load_dotenv
 
 from db import create_jira_tables, drop_jira_tables, VectorDB, DBConfig
 
-load_dotenv()
 
-PG_PWD = os.getenv("PG_PWD")
+def main():
+    """
+    Drops and recreates the Jira tables of the hackathon database.
+    """
+    load_dotenv()
 
-if PG_PWD is None:
-    raise ValueError("PG_PWD environment variable is not set.")
+    pg_pwd = os.getenv("PG_PWD")
 
-client = VectorDB(
-    DBConfig(
-        dbname="hackathon_ofa",
-        user="hackathon_ofa",
-        password=PG_PWD,
-        host="hackathon-ofa.postgres.database.azure.com"
-    )
-)
-drop_jira_tables(client)
-create_jira_tables(client)
+    if pg_pwd is None:
+        raise ValueError("PG_PWD environment variable is not set.")
 
-print(client.describe_database())
+    with VectorDB(
+        DBConfig(
+            dbname="hackathon_ofa",
+            user="hackathon_ofa",
+            password=pg_pwd,
+            host="hackathon-ofa.postgres.database.azure.com"
+        )
+    ) as client:
+        drop_jira_tables(client)
+        create_jira_tables(client)
+
+        print(client.describe_database())
+
+
+if __name__ == "__main__":
+    main()